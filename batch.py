@@ -0,0 +1,132 @@
+import asyncio
+import csv
+import json
+import os
+import time
+
+from config import BATCH_CONCURRENCY
+from metrics import latency_summary
+from scrapers import orchestrator
+from planners import trip_planner
+from planners.ranking import rank_tables
+
+
+def load_requests(path):
+    """
+    Reads trip requests from a JSONL or CSV file. Each request needs a
+    destination, start_date and end_date; interests may be a list or a
+    comma-separated string, and an optional id is carried to the output.
+    Rows that cannot be parsed are kept with an "error" so they are
+    reported per request instead of aborting the batch.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [line.strip() for line in f if line.strip()]
+
+    requests = []
+    for index, row in enumerate(rows):
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            interests = row.get("interests") or []
+            if isinstance(interests, str):
+                interests = interests.split(",")
+            requests.append({
+                "id": row.get("id") or str(index + 1),
+                "destination": row["destination"].strip(),
+                "start_date": row["start_date"],
+                "end_date": row["end_date"],
+                "interests": [interest.strip() for interest in interests if interest.strip()],
+            })
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            requests.append({
+                "id": (isinstance(row, dict) and row.get("id")) or str(index + 1),
+                "row": row,
+                "error": f"Malformed request: {type(e).__name__}: {e}",
+            })
+    return requests
+
+
+async def run_batch(input_path, output_path, concurrency=BATCH_CONCURRENCY):
+    """
+    Plans every request in input_path with at most `concurrency` plans in
+    flight, scraping each destination only once, and appends each plan to
+    output_path (JSONL) as soon as it completes. Requests for the same
+    destination and dates share one scrape.
+    """
+    requests = load_requests(input_path)
+    slots = asyncio.Semaphore(concurrency)
+    scrapes = {}
+    scraped = 0
+    latencies = []
+    failures = 0
+
+    def scrape_key(request):
+        return (request["destination"].lower(), request["start_date"], request["end_date"])
+
+    # A scrape's results are dropped once the last request that needs them
+    # is done, so a long batch does not hold every destination's data.
+    users = {}
+    for request in requests:
+        if "error" not in request:
+            users[scrape_key(request)] = users.get(scrape_key(request), 0) + 1
+
+    def scrape(request):
+        nonlocal scraped
+        key = scrape_key(request)
+        if key not in scrapes:
+            scrapes[key] = asyncio.ensure_future(
+                orchestrator.scrape_all(request["destination"], request["start_date"], request["end_date"])
+            )
+            scraped += 1
+        return scrapes[key]
+
+    def release(request):
+        key = scrape_key(request)
+        users[key] -= 1
+        if not users[key]:
+            scrapes.pop(key, None)
+
+    async def run_one(request):
+        # Latency includes the time spent waiting for a slot.
+        started = time.perf_counter()
+        if "error" in request:
+            return request, None, request["error"], time.perf_counter() - started
+        async with slots:
+            try:
+                all_data = await scrape(request)
+                trip_plan = await trip_planner.plan(
+                    rank_tables(all_data, request["interests"]), request["destination"],
+                    request["start_date"], request["end_date"], request["interests"],
+                )
+                return request, trip_plan, None, time.perf_counter() - started
+            except Exception as e:
+                return request, None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+            finally:
+                release(request)
+
+    started = time.perf_counter()
+    with open(output_path, "a", encoding="utf-8") as out:
+        for result in asyncio.as_completed([run_one(request) for request in requests]):
+            request, trip_plan, error, elapsed = await result
+            latencies.append(elapsed)
+            if error is not None:
+                failures += 1
+            out.write(json.dumps({
+                "id": request["id"],
+                "request": request,
+                "plan": trip_plan,
+                "error": error,
+                "elapsed": round(elapsed, 3),
+            }, ensure_ascii=False) + "\n")
+            out.flush()
+    total = time.perf_counter() - started
+
+    summary = latency_summary(latencies)
+    print(f"Planned {len(requests)} trips ({failures} failed, {scraped} destinations/dates scraped) in {total:.2f}s")
+    print(f"Throughput: {len(requests) / total if total else 0:.2f} plans/s")
+    print(f"Latency: p50 {summary['p50']:.3f}s, p95 {summary['p95']:.3f}s")
+    print(f"Plan cache hit rate: {trip_planner.plan_cache.stats()['hit_rate']:.1%}")
+    return summary
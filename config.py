@@ -7,3 +7,121 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
 # Other configurations
 HEADLESS_BROWSER = True
+
+# Scraper orchestration
+# Per-source deadline in seconds; sources that miss it are flagged as missing.
+SCRAPER_TIMEOUTS = {
+    "ctrip": 10.0,
+    "hsr": 10.0,
+    "dianping": 10.0,
+}
+SCRAPER_DEFAULT_TIMEOUT = 10.0
+
+# Base URL per source. When unset, the scraper returns its built-in sample data.
+SCRAPER_BASE_URLS = {
+    "ctrip": os.environ.get("CTRIP_BASE_URL"),
+    "hsr": os.environ.get("HSR_BASE_URL"),
+    "dianping": os.environ.get("DIANPING_BASE_URL"),
+}
+
+# Shared HTTP client used by all scrapers
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 15.0
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY = 30.0
+HTTP_MAX_CONNECTIONS_PER_HOST = 8
+HTTP2_ENABLED = True
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# On-disk scrape cache
+SCRAPE_CACHE_PATH = os.environ.get("SCRAPE_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "scrape_cache.sqlite3"))
+SCRAPE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Seconds a cached result is served as fresh, per source.
+SCRAPE_CACHE_TTL = {
+    "ctrip": 6 * 3600,
+    "hsr": 24 * 3600,
+    "dianping": 12 * 3600,
+}
+SCRAPE_CACHE_DEFAULT_TTL = 6 * 3600
+# Seconds past the TTL during which a stale result is still served while a
+# background refresh runs; older entries are treated as a miss.
+SCRAPE_CACHE_STALE_TTL = 7 * 24 * 3600
+
+# Playwright browser pool for JS-rendered pages (Ctrip, Dianping)
+USE_BROWSER_POOL = os.environ.get("USE_BROWSER_POOL") == "1"
+BROWSER_POOL_SIZE = 4
+BROWSER_PAGES_PER_CONTEXT = 50
+BROWSER_NAVIGATION_TIMEOUT = 30.0
+BROWSER_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BROWSER_BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "cnzz.com",
+    "hm.baidu.com",
+)
+
+# Streaming scrapers
+SCRAPER_MAX_PAGES = 50
+# Records buffered between the scrapers and the consumer before producers wait.
+SCRAPER_STREAM_BUFFER = 256
+# Items a shared stream keeps for callers that join late; past this, consumed
+# items are dropped and later callers start a fresh run.
+SINGLE_FLIGHT_REPLAY_LIMIT = 256
+# Records of each kind kept for planning while streaming.
+PLANNER_TOP_K = 20
+
+# Batch planning
+BATCH_CONCURRENCY = 8
+
+# Per-source adaptive rate limiting (requests per second)
+SCRAPER_RATE_LIMITS = {
+    "ctrip": 5.0,
+    "hsr": 5.0,
+    "dianping": 3.0,
+}
+SCRAPER_DEFAULT_RATE = 5.0
+SCRAPER_MIN_RATE = 0.2
+SCRAPER_MAX_RATE = 50.0
+# Requests/s added after each successful request (additive increase).
+SCRAPER_RATE_INCREASE = 0.05
+# Factor applied to the rate on a throttling signal (multiplicative decrease).
+SCRAPER_RATE_DECREASE = 0.5
+SCRAPER_BACKOFF_BASE = 1.0
+SCRAPER_BACKOFF_MAX = 60.0
+HTTP_MAX_RETRIES = 4
+HTTP_THROTTLE_STATUSES = {403, 429}
+CAPTCHA_MARKERS = ("captcha", "验证码", "slider-verify", "安全验证")
+
+# LLM planning
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+# Token budget for the whole planning prompt, including the scraped tables.
+PROMPT_TOKEN_BUDGET = 1500
+
+# Plan cache in front of the LLM call
+PLAN_CACHE_MAX_ENTRIES = 1000
+PLAN_CACHE_TTL = 24 * 3600
+# Semantic lookup embeds the normalised request and reuses a cached plan whose
+# cosine similarity is at least the threshold.
+PLAN_CACHE_SEMANTIC = os.environ.get("PLAN_CACHE_SEMANTIC") == "1"
+PLAN_CACHE_SIMILARITY_THRESHOLD = 0.95
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+PLAN_MAX_TOKENS = 2048
+
+# LLM backend. Without an API key there is none and the planner returns a
+# dummy plan; the simulated "fake" backend is only installed explicitly
+# (llm.set_backend), e.g. by tools/bench/bench_planner.py.
+LLM_BACKEND = "openai" if OPENAI_API_KEY else None
+
+# Plan server (SSE streaming endpoint)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+
+# Plan change history
+PLAN_HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "plan_history")
+# A full plan snapshot is written every this many revisions.
+PLAN_HISTORY_SNAPSHOT_EVERY = 20
+# Tokens of change history included in a prompt.
+PLAN_HISTORY_TOKEN_BUDGET = 300
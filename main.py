@@ -1,34 +1,78 @@
+import argparse
 import asyncio
-from scrapers import ctrip_scraper, hsr_scraper, dianping_scraper
+import time
+import batch
+from config import BATCH_CONCURRENCY
+from scrapers import orchestrator, http_client, cache, browser_pool
 from planners import trip_planner
+from planners.ranking import RecordCollector
+
+
+async def collect(destination, start_date, end_date, interests):
+    """
+    Consumes the streamed records of all sources as they arrive and ranks
+    them incrementally, keeping only the best few of each kind.
+    """
+    collector = RecordCollector(interests)
+    started = time.perf_counter()
+    first = None
+    async for source, kind, record in orchestrator.stream_all(destination, start_date, end_date):
+        if first is None and kind != "missing":
+            first = time.perf_counter() - started
+            print(f"First result from {source} after {first:.2f}s")
+        if kind == "missing":
+            print(f"Source {source} missing: {record}")
+        collector.add(source, kind, record)
+    return collector.to_data()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Plan a trip interactively, or a batch of trips from a file.")
+    parser.add_argument("--batch", help="JSONL or CSV file of trip requests (destination, start_date, end_date, interests)")
+    parser.add_argument("--output", default="plans.jsonl", help="JSONL file the batch plans are appended to")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Maximum plans in flight")
+    return parser.parse_args()
+
+
+async def shutdown():
+    """
+    Releases the shared scraping resources.
+    """
+    # Let stale-cache refreshes finish so the next run sees fresh data.
+    await cache.wait_for_refreshes()
+    await http_client.close()
+    await browser_pool.close()
+
 
 async def main():
     """
     Main function to run the trip planning process.
     """
+    args = parse_args()
+    if args.batch:
+        try:
+            await batch.run_batch(args.batch, args.output, args.concurrency)
+        finally:
+            await shutdown()
+        return
+
     # Get user input for destination, start_date, end_date, and interests
     destination = input("Enter your destination: ")
     start_date = input("Enter the start date (YYYY-MM-DD): ")
     end_date = input("Enter the end date (YYYY-MM-DD): ")
     interests = input("Enter your interests (comma-separated): ").split(',')
 
-    # Scrape data from different sources
-    ctrip_data = await ctrip_scraper.scrape(destination)
-    hsr_data = await hsr_scraper.scrape(destination)
-    dianping_data = await dianping_scraper.scrape(destination)
-
-    # Combine and process the scraped data
-    all_data = {
-        "ctrip": ctrip_data,
-        "hsr": hsr_data,
-        "dianping": dianping_data,
-    }
-
-    # Generate the trip plan
-    trip_plan = await trip_planner.plan(all_data, destination, start_date, end_date, interests)
+    try:
+        # Stream all sources concurrently; sources that miss their deadline
+        # are listed under all_data["missing"] and the plan uses what arrived.
+        all_data = await collect(destination, start_date, end_date, interests)
 
-    # Print the trip plan
-    print(trip_plan)
+        # Generate the trip plan, printing each day as soon as it is written
+        async for chunk in trip_planner.plan_stream(all_data, destination, start_date, end_date, interests):
+            print(chunk, end="", flush=True)
+        print()
+    finally:
+        await shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,27 @@
+import math
+
+
+def percentile(samples, pct):
+    """
+    Returns the pct-th percentile (0-100) of samples using nearest-rank.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(samples):
+    """
+    Summarises latency samples in seconds as count, mean, p50, p95 and p99.
+    Missing samples (None) are ignored.
+    """
+    samples = [sample for sample in samples if sample is not None]
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+    }
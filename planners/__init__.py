@@ -1 +1,10 @@
 from . import trip_planner
+from . import ranking
+from . import prompt_builder
+from . import plan_cache
+from . import scheduler
+from . import replanner
+from . import distance_matrix
+from . import candidates
+from . import history
+from . import llm
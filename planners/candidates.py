@@ -0,0 +1,135 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+
+from .scheduler import schedule, to_minutes
+
+# Slider axes of spec §3.4.1, in score-column order. Higher is better on every axis.
+AXES = ("price", "comfort", "relaxation", "transit")
+
+# Daily start/end times per pace.
+PACES = {
+    "relaxed": (to_minutes("09:00"), to_minutes("20:00")),
+    "standard": (to_minutes("08:00"), to_minutes("21:00")),
+    "packed": (to_minutes("07:30"), to_minutes("22:00")),
+}
+
+
+def _build_candidate(args):
+    """
+    Schedules one variant of the trip. Runs in a worker process, so it only
+    takes and returns picklable values.
+    """
+    seed, days, pois, restaurants, hotel, pace = args
+    rng = random.Random(seed)
+    start, end = PACES[pace]
+    # Days on the default start take the pace's start; days that start later
+    # (e.g. arrival at 12:30) keep their own.
+    days = [
+        replace(day, start=start if day.start == PACES["standard"][0] else max(day.start, start), end=end,
+                lodging=day.lodging or (hotel["name"] if hotel else None))
+        for day in days
+    ]
+    # Jitter priorities so variants visit different subsets and orders of POIs.
+    pois = [replace(poi, priority=poi.priority * 10 + rng.randint(0, 9)) for poi in pois]
+    restaurants = list(restaurants)
+    rng.shuffle(restaurants)
+    day_plans = schedule(days, pois, restaurants)
+
+    nights = sum(1 for day in days if day.lodging)
+    minutes = {"sight": 0, "rest": 0, "move": 0, "leg": 0}
+    longest_day = 0
+    for day_plan in day_plans:
+        for slot in day_plan.slots:
+            if slot.kind in minutes:
+                minutes[slot.kind] += slot.end - slot.start
+        if day_plan.slots:
+            longest_day = max(longest_day, day_plan.slots[-1].end - day_plan.slots[0].start)
+    # An unknown price is NaN, which _normalise ranks worst rather than free.
+    price = float(hotel["price"]) if hotel and hotel.get("price") is not None else float("nan")
+    features = {
+        "cost": nights * price,
+        "hotel_price": price,
+        "longest_day": longest_day,
+        "rest": minutes["rest"],
+        "sights": minutes["sight"],
+        "moving": minutes["move"] + minutes["leg"],
+    }
+    meta = {"seed": seed, "pace": pace, "hotel": hotel["name"] if hotel else None}
+    return day_plans, meta, features
+
+
+def _normalise(values, higher_is_better=True):
+    # Scales the known values to 0..1 (best = 1); NaN (unknown) scores 0.
+    values = np.asarray(values, dtype=np.float64)
+    known = ~np.isnan(values)
+    scaled = np.zeros(values.shape)
+    if not known.any():
+        return np.full(values.shape, 0.5)
+    low, high = values[known].min(), values[known].max()
+    scaled[known] = (values[known] - low) / (high - low) if high > low else 0.5
+    if not higher_is_better:
+        scaled[known] = 1.0 - scaled[known]
+    return scaled
+
+
+class CandidatePool:
+    """
+    A precomputed set of candidate itineraries with one score per slider
+    axis, so slider changes only need a re-rank.
+    """
+
+    def __init__(self, results):
+        self.plans = [day_plans for day_plans, _, _ in results]
+        self.meta = [meta for _, meta, _ in results]
+        features = [f for _, _, f in results]
+        column = lambda name: [f[name] for f in features]
+        self.scores = np.column_stack((
+            _normalise(column("cost"), higher_is_better=False),
+            0.5 * _normalise(column("hotel_price")) + 0.5 * _normalise(column("longest_day"), higher_is_better=False),
+            _normalise(column("rest")),
+            _normalise(column("moving"), higher_is_better=False),
+        ))
+
+    def __len__(self):
+        return len(self.plans)
+
+    def rank(self, weights, limit=5):
+        """
+        Ranks candidates for slider positions given as {axis: weight}
+        (missing axes weigh 0). Returns [(index, score), ...], best first.
+        """
+        vector = np.array([float(weights.get(axis, 0.0)) for axis in AXES])
+        total = vector.sum()
+        combined = self.scores @ (vector / total if total else vector)
+        limit = min(limit, len(combined))
+        top = np.argpartition(-combined, limit - 1)[:limit]
+        top = top[np.lexsort((top, -combined[top]))]
+        return [(int(i), float(combined[i])) for i in top]
+
+    def best(self, weights):
+        """
+        Returns the day plans of the best candidate for the slider positions.
+        """
+        return self.plans[self.rank(weights, limit=1)[0][0]]
+
+
+def generate(days, pois, restaurants=(), hotels=(), count=24, max_workers=None):
+    """
+    Builds `count` candidate itineraries in parallel across a process pool,
+    varying pace, hotel and POI/restaurant order. Identical inputs give
+    identical candidates.
+    """
+    if count < 1:
+        raise ValueError(f"count must be at least 1, got {count}")
+    hotels = list(hotels) or [None]
+    paces = list(PACES)
+    jobs = [
+        (seed, list(days), list(pois), list(restaurants), hotels[seed % len(hotels)], paces[seed // len(hotels) % len(paces)])
+        for seed in range(count)
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_build_candidate, jobs, chunksize=max(1, count // 16)))
+    return CandidatePool(results)
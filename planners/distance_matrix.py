@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Per mode: average speed (km/h), detour factor over the great-circle
+# distance, and fixed overhead in minutes (waiting, parking, walking to stops).
+SPEED_PROFILES = {
+    "walk": (4.5, 1.25, 0.0),
+    "transit": (18.0, 1.35, 10.0),
+    "drive": (35.0, 1.3, 5.0),
+}
+
+MATRIX_CACHE_SIZE = 32
+
+
+def haversine_matrix(lats, lngs):
+    """
+    Returns the pairwise great-circle distances in km between all points
+    as an (n, n) float64 array.
+
+    Points are mapped to unit vectors so all pairs come from one matrix
+    product; the chord length then gives the same result as the haversine
+    formula to well under a metre.
+    """
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lng = np.radians(np.asarray(lngs, dtype=np.float64))
+    xyz = np.column_stack((np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)))
+    chord_sq = np.clip(2.0 - 2.0 * (xyz @ xyz.T), 0.0, 4.0)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(chord_sq) / 2)
+
+
+def travel_minutes(km, mode):
+    """
+    Estimates travel minutes from a distance matrix with a speed profile.
+    The diagonal stays zero.
+    """
+    speed, detour, overhead = SPEED_PROFILES[mode]
+    minutes = km * (detour / speed * 60.0) + overhead
+    np.fill_diagonal(minutes, 0.0)
+    return minutes
+
+
+class DistanceMatrix:
+    """
+    Distances and per-mode travel times between a fixed list of POIs
+    (anything with `name`, `lat` and `lng`, e.g. scheduler.POI). Rows and
+    columns of POIs without coordinates are NaN.
+    """
+
+    def __init__(self, pois):
+        self.pois = list(pois)
+        self.index = {poi.name: i for i, poi in enumerate(self.pois)}
+        lats = np.array([np.nan if poi.lat is None else poi.lat for poi in self.pois], dtype=np.float64)
+        lngs = np.array([np.nan if poi.lng is None else poi.lng for poi in self.pois], dtype=np.float64)
+        self.located = ~(np.isnan(lats) | np.isnan(lngs))
+        self.km = haversine_matrix(lats, lngs)
+        self.minutes = {mode: travel_minutes(self.km, mode) for mode in SPEED_PROFILES}
+        self.refined = {mode: np.zeros(self.km.shape, dtype=bool) for mode in SPEED_PROFILES}
+
+    def nearest(self, k):
+        """
+        Returns an (n, k) array with the indices of each POI's k nearest others
+        among those with coordinates; rows of POIs without coordinates are -1.
+        """
+        k = max(0, min(k, int(self.located.sum()) - 1))
+        n = len(self.pois)
+        if k == 0:
+            return np.full((n, 0), -1, dtype=np.intp)
+        km = np.where(np.isnan(self.km), np.inf, self.km)
+        np.fill_diagonal(km, np.inf)
+        nearest = np.argpartition(km, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(km, nearest, axis=1).argsort(axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest[~self.located] = -1
+        return nearest
+
+    def refine(self, route, mode="transit", k=3, max_workers=4):
+        """
+        Replaces the estimates for each POI's k nearest neighbours with real
+        routing results. `route(origin, destination, mode)` returns minutes
+        (or None to keep the estimate); it is called once per unordered
+        pair, concurrently, and the result is used in both directions.
+        """
+        pairs = sorted({tuple(sorted((i, int(j)))) for i, row in enumerate(self.nearest(k)) for j in row if j >= 0})
+        pairs = [(i, j) for i, j in pairs if not self.refined[mode][i, j]]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(lambda pair: route(self.pois[pair[0]], self.pois[pair[1]], mode), pairs))
+        for (i, j), minutes in zip(pairs, results):
+            if minutes is not None:
+                self.minutes[mode][i, j] = self.minutes[mode][j, i] = minutes
+                self.refined[mode][i, j] = self.refined[mode][j, i] = True
+        return len(pairs)
+
+    def travel_time(self, mode="transit"):
+        """
+        Returns a `travel_time(a, b)` callable for planners.scheduler; POIs
+        not in the matrix or without coordinates fall back to the scheduler's
+        estimate (its default without coordinates).
+        """
+        from .scheduler import haversine_travel
+
+        minutes = self.minutes[mode]
+
+        def lookup(a, b):
+            i = self.index.get(a.name) if a is not None else None
+            j = self.index.get(b.name) if b is not None else None
+            if i is None or j is None or np.isnan(minutes[i, j]):
+                return haversine_travel(a, b)
+            return int(round(minutes[i, j]))
+
+        return lookup
+
+
+_cache = OrderedDict()
+
+
+def get_matrix(destination, pois):
+    """
+    Returns the distance matrix for a destination's POIs, reusing the cached
+    one (with any routing refinements) while the POI list is unchanged.
+    """
+    key = (destination.strip().lower(), tuple((poi.name, poi.lat, poi.lng) for poi in pois))
+    matrix = _cache.get(key)
+    if matrix is None:
+        matrix = _cache[key] = DistanceMatrix(pois)
+        while len(_cache) > MATRIX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    _cache.move_to_end(key)
+    return matrix
@@ -0,0 +1,192 @@
+import bisect
+import json
+import os
+import time
+from dataclasses import asdict, is_dataclass
+
+from config import PLAN_HISTORY_DIR, PLAN_HISTORY_SNAPSHOT_EVERY, PLAN_HISTORY_TOKEN_BUDGET
+from .prompt_builder import count_tokens
+
+
+def describe_change(change):
+    """
+    One-line summary of a replanner.Change, as shown to the model.
+    """
+    if change.kind == "add_day":
+        names = "、".join(poi.name for poi in change.pois)
+        return f"在第{change.day + 1}天插入一天（{change.spec.city}{'：' + names if names else ''}）"
+    if change.kind == "remove_day":
+        return f"删除第{change.day + 1}天"
+    if change.kind == "change_day":
+        return f"调整第{change.day + 1}天（{change.spec.city}）"
+    if change.kind == "add_poi":
+        return f"加入{'、'.join(poi.name for poi in change.pois)}"
+    if change.kind == "remove_poi":
+        return f"移除{change.name}"
+    return change.kind
+
+
+class HistoryStore:
+    """
+    Append-only revision log of one plan, with periodic full snapshots.
+
+    Revisions are appended as JSON lines to revisions.jsonl and never
+    rewritten. Every `snapshot_every` revisions the caller's full plan
+    state goes to snapshots.jsonl, so a past state is the nearest snapshot
+    plus the revisions after it. An in-memory index of line offsets and a
+    per-day list of revision numbers make lookups bisect + seek instead of
+    rereading the log.
+    """
+
+    def __init__(self, plan_id, root=PLAN_HISTORY_DIR, snapshot_every=PLAN_HISTORY_SNAPSHOT_EVERY):
+        self.directory = os.path.join(root, plan_id)
+        self.snapshot_every = snapshot_every
+        os.makedirs(self.directory, exist_ok=True)
+        self.revisions_path = os.path.join(self.directory, "revisions.jsonl")
+        self.snapshots_path = os.path.join(self.directory, "snapshots.jsonl")
+        self._offsets = []        # byte offset of revision i
+        self._by_day = {}         # day index -> sorted revision numbers touching it
+        self._snapshots = []      # (revision, byte offset in snapshots.jsonl)
+        self._load_index()
+
+    @staticmethod
+    def _scan(path):
+        """
+        Yields (record, offset) for each line of a JSONL log. A torn last
+        line (a write interrupted by a crash) is cut off the file so later
+        appends start on a clean line; corruption elsewhere still raises.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "r+b") as f:
+            offset = 0
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("no trailing newline")
+                    record = json.loads(line)
+                except ValueError:
+                    if f.read(1):
+                        raise
+                    print(f"Truncating torn last line of {path} at byte {offset} ({len(line)} bytes dropped)")
+                    f.truncate(offset)
+                    return
+                yield record, offset
+                offset += len(line)
+
+    def _load_index(self):
+        for record, offset in self._scan(self.revisions_path):
+            self._index(record, offset)
+        for record, offset in self._scan(self.snapshots_path):
+            # A snapshot of a revision whose own line was torn is unusable.
+            if record["revision"] < len(self._offsets):
+                self._snapshots.append((record["revision"], offset))
+
+    def _index(self, record, offset):
+        self._offsets.append(offset)
+        for day in record["days"]:
+            self._by_day.setdefault(day, []).append(record["revision"])
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def append(self, change, affected_days, state=None, summary=None):
+        """
+        Records a revision and returns its number. `change` may be a
+        replanner.Change or any JSON-serialisable value; `state` (the full
+        plan after the change) is written as a snapshot when one is due.
+        """
+        revision = len(self._offsets)
+        record = {
+            "revision": revision,
+            "time": time.time(),
+            "days": sorted(affected_days),
+            "summary": summary or (describe_change(change) if is_dataclass(change) else str(change)),
+            "change": asdict(change) if is_dataclass(change) else change,
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.revisions_path, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+        self._index(record, offset)
+        if state is not None and (revision + 1) % self.snapshot_every == 0:
+            self.snapshot(revision, state)
+        return revision
+
+    def snapshot(self, revision, state):
+        """
+        Writes the full plan state as of `revision`.
+        """
+        line = (json.dumps({"revision": revision, "state": state}, ensure_ascii=False, default=asdict) + "\n").encode("utf-8")
+        with open(self.snapshots_path, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+        self._snapshots.append((revision, offset))
+
+    def get(self, revision):
+        """
+        Reads one revision by seeking straight to its line.
+        """
+        with open(self.revisions_path, "rb") as f:
+            f.seek(self._offsets[revision])
+            return json.loads(f.readline())
+
+    def state_at(self, revision):
+        """
+        Returns (snapshot_state, later_revisions): the latest snapshot taken
+        at or before `revision` and the revisions to replay on top of it.
+        """
+        i = bisect.bisect_right(self._snapshots, (revision, float("inf"))) - 1
+        if i < 0:
+            return None, [self.get(r) for r in range(0, revision + 1)]
+        snapshot_revision, offset = self._snapshots[i]
+        with open(self.snapshots_path, "rb") as f:
+            f.seek(offset)
+            state = json.loads(f.readline())["state"]
+        return state, [self.get(r) for r in range(snapshot_revision + 1, revision + 1)]
+
+    def _relevant(self, days, before):
+        """
+        Revision numbers below `before` touching any of `days`, newest first.
+        """
+        if days is None:
+            yield from range(before - 1, -1, -1)
+            return
+        heads = []
+        for day in days:
+            revisions = self._by_day.get(day, [])
+            heads.append((revisions, bisect.bisect_left(revisions, before)))
+        seen = set()
+        while True:
+            best = max(((revisions[end - 1], k) for k, (revisions, end) in enumerate(heads) if end > 0), default=None)
+            if best is None:
+                return
+            revision, k = best
+            revisions, end = heads[k]
+            heads[k] = (revisions, end - 1)
+            if revision not in seen:
+                seen.add(revision)
+                yield revision
+
+    def recent(self, limit=10, days=None, budget=PLAN_HISTORY_TOKEN_BUDGET):
+        """
+        Returns up to `limit` most recent revisions, optionally only those
+        touching `days`, newest first and cut off once their summaries
+        exceed `budget` tokens.
+        """
+        records, used = [], 0
+        for revision in self._relevant(days, len(self._offsets)):
+            record = self.get(revision)
+            cost = count_tokens(record["summary"])
+            if len(records) >= limit or used + cost > budget:
+                break
+            records.append(record)
+            used += cost
+        return records
+
+    def prompt_context(self, limit=10, days=None, budget=PLAN_HISTORY_TOKEN_BUDGET):
+        """
+        Renders the recent changes as prompt lines, oldest first.
+        """
+        records = self.recent(limit, days, budget)
+        return "\n".join(f"- 修订 {record['revision'] + 1}: {record['summary']}" for record in reversed(records))
@@ -0,0 +1,139 @@
+import asyncio
+import random
+import re
+from datetime import date
+
+import openai
+from config import LLM_BACKEND, OPENAI_API_KEY, OPENAI_MODEL, PLAN_MAX_TOKENS
+
+
+class LLMError(Exception):
+    """
+    Raised by a backend when a completion fails, before or mid-stream.
+    """
+
+
+class OpenAIBackend:
+    """
+    Streams chat completions from the OpenAI API.
+    """
+
+    name = "openai"
+
+    def __init__(self, model=OPENAI_MODEL, api_key=OPENAI_API_KEY):
+        self.model = model
+        self.client = openai.AsyncOpenAI(api_key=api_key)
+
+    async def stream(self, prompt, max_tokens=PLAN_MAX_TOKENS):
+        """
+        Yields the answer to the prompt as text deltas.
+        """
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except openai.OpenAIError as e:
+            raise LLMError(str(e)) from e
+
+
+# "from 2025-08-01 to 2025-08-03" in a planning prompt.
+DATE_RANGE = re.compile(r"from (\d{4}-\d{2}-\d{2}) to (\d{4}-\d{2}-\d{2})")
+# A token is roughly a word with its trailing whitespace, or one CJK character.
+TOKEN = re.compile(r"[一-鿿]|[^\s一-鿿]+\s*|\s+")
+
+ACTIVITIES = ("Breakfast near the hotel", "Visit the old town", "Lunch at a local restaurant",
+              "Museum or park visit", "Afternoon tea break", "Dinner and evening walk")
+
+
+def fake_plan(prompt):
+    """
+    A plausible day-by-day plan for a planning prompt, sized by its dates.
+    """
+    days = 3
+    match = DATE_RANGE.search(prompt)
+    if match:
+        try:
+            start, end = (date.fromisoformat(value) for value in match.groups())
+            days = max(1, min((end - start).days + 1, 14))
+        except ValueError:
+            pass
+    lines = []
+    for day in range(1, days + 1):
+        lines.append(f"Day {day}")
+        lines.extend(f"- {9 + 2 * i:02d}:00 {activity}" for i, activity in enumerate(ACTIVITIES))
+        lines.append("")
+    return "\n".join(lines)
+
+
+class FakeBackend:
+    """
+    Local stand-in for a streaming model, for benchmarks. Never selected
+    by default; install it with set_backend().
+
+    Time to first token is log-normal around `ttft` so there is a tail;
+    tokens then arrive at about `tokens_per_second`. With probability
+    `error_rate` a completion fails, half the time before the first token
+    and half the time mid-stream.
+    """
+
+    name = "fake"
+
+    def __init__(self, ttft=0.4, tokens_per_second=60.0, error_rate=0.0, respond=fake_plan, seed=None):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.respond = respond
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    async def stream(self, prompt, max_tokens=PLAN_MAX_TOKENS):
+        self.calls += 1
+        tokens = TOKEN.findall(self.respond(prompt))[:max_tokens]
+        fail_at = None
+        if self.random.random() < self.error_rate:
+            fail_at = self.random.choice((0, self.random.randrange(1, max(2, len(tokens)))))
+
+        if self.ttft > 0:
+            await asyncio.sleep(self.ttft * self.random.lognormvariate(0, 0.35))
+        interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for i, token in enumerate(tokens):
+            if i == fail_at:
+                raise LLMError(f"simulated failure after {i} tokens")
+            if i and interval:
+                await asyncio.sleep(interval)
+            yield token
+        if fail_at is not None and fail_at >= len(tokens):
+            raise LLMError("simulated failure at end of stream")
+
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "fake": FakeBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    """
+    Returns the process-wide backend, created from LLM_BACKEND on first use,
+    or None when no backend is configured (no API key).
+    """
+    global _backend
+    if _backend is None and LLM_BACKEND:
+        _backend = BACKENDS[LLM_BACKEND]()
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Replaces the process-wide backend, e.g. with a tuned FakeBackend.
+    """
+    global _backend
+    _backend = backend
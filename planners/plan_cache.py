@@ -0,0 +1,167 @@
+import json
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config import (
+    PLAN_CACHE_MAX_ENTRIES,
+    PLAN_CACHE_TTL,
+    PLAN_CACHE_SIMILARITY_THRESHOLD,
+    OPENAI_EMBEDDING_MODEL,
+)
+
+
+def normalize(destination, start_date, end_date, interests):
+    """
+    Normalises plan inputs so trivially different requests share a key:
+    case and surrounding whitespace are ignored and interests are
+    deduplicated and sorted.
+    """
+    interests = sorted({interest.strip().lower() for interest in interests if interest.strip()})
+    return json.dumps(
+        [destination.strip().lower(), (start_date or "").strip(), (end_date or "").strip(), interests],
+        ensure_ascii=False,
+    )
+
+
+def describe(key):
+    """
+    Renders a normalised key as the text that gets embedded.
+    """
+    destination, start_date, end_date, interests = json.loads(key)
+    return f"Trip to {destination} from {start_date} to {end_date}, interested in {', '.join(interests)}"
+
+
+_openai_client = None
+
+
+async def openai_embed(text):
+    """
+    Embeds text with the OpenAI embeddings API, reusing one client.
+    """
+    global _openai_client
+    if _openai_client is None:
+        import openai
+
+        _openai_client = openai.AsyncOpenAI()
+    response = await _openai_client.embeddings.create(model=OPENAI_EMBEDDING_MODEL, input=text)
+    return response.data[0].embedding
+
+
+class PlanCache:
+    """
+    In-memory cache of generated plans with exact lookup on normalised
+    inputs and optional embedding-similarity lookup. `data_key` (e.g. a
+    digest of the scraped data) is part of every key, so plans made from
+    different listings are never mixed up.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    dropped once `max_entries` is reached. `embed` is an async callable
+    returning a vector for a text; without it, or when it fails, only exact
+    hits are served. Similarity only picks among entries for the same
+    destination, dates and data, so it can only bridge differently worded
+    interests.
+    """
+
+    def __init__(self, max_entries=PLAN_CACHE_MAX_ENTRIES, ttl=PLAN_CACHE_TTL,
+                 embed=None, threshold=PLAN_CACHE_SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed = embed
+        self.threshold = threshold
+        self._entries = OrderedDict()
+        # Query vectors computed by a missed get(), reused by the put() that
+        # follows it; bounded like the entries.
+        self._vectors = OrderedDict()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _expire(self, now):
+        for key in [key for key, entry in self._entries.items() if now - entry["stored_at"] >= self.ttl]:
+            del self._entries[key]
+
+    async def _vector(self, text_key):
+        # None when the embedding call fails; the cache then works on exact keys.
+        vector = self._vectors.pop(text_key, None)
+        if vector is None:
+            try:
+                vector = np.asarray(await self.embed(describe(text_key)), dtype=np.float32)
+            except Exception as e:
+                print(f"Plan cache embedding failed, using exact lookup only: {type(e).__name__}: {e}")
+                return None
+            vector /= np.linalg.norm(vector) or 1.0
+        return vector
+
+    @staticmethod
+    def _scope(key):
+        text_key, data_key = key
+        return json.loads(text_key)[:3], data_key
+
+    async def _similar(self, key):
+        scope = self._scope(key)
+        vectors = [(k, entry["vector"]) for k, entry in self._entries.items()
+                   if entry["vector"] is not None and entry["scope"] == scope]
+        if not vectors:
+            return None, None
+        query = await self._vector(key[0])
+        if query is None:
+            return None, None
+        scores = np.stack([vector for _, vector in vectors]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return vectors[best][0], query
+        return None, query
+
+    async def get(self, destination, start_date, end_date, interests, data_key=""):
+        """
+        Returns a cached plan for the request, or None.
+        """
+        key = (normalize(destination, start_date, end_date, interests), data_key)
+        self._expire(time.time())
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["plan"]
+        if self.embed is not None:
+            similar, query = await self._similar(key)
+            if similar is not None:
+                self._entries.move_to_end(similar)
+                self.semantic_hits += 1
+                return self._entries[similar]["plan"]
+            if query is not None:
+                self._vectors[key[0]] = query
+                while len(self._vectors) > self.max_entries:
+                    self._vectors.popitem(last=False)
+        self.misses += 1
+        return None
+
+    async def put(self, destination, start_date, end_date, interests, plan, data_key=""):
+        """
+        Stores a generated plan, evicting the least recently used entry if full.
+        """
+        key = (normalize(destination, start_date, end_date, interests), data_key)
+        vector = await self._vector(key[0]) if self.embed is not None else None
+        self._entries[key] = {"plan": plan, "stored_at": time.time(), "vector": vector, "scope": self._scope(key)}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self._vectors.clear()
+
+    def stats(self):
+        """
+        Returns hit/miss counts and the overall hit rate.
+        """
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
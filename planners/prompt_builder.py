@@ -0,0 +1,126 @@
+import re
+
+import pandas as pd
+
+from config import OPENAI_MODEL, PROMPT_TOKEN_BUDGET
+from .ranking import rank_tables
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_encoding = None
+_CJK = re.compile(r"[　-〿㐀-鿿豈-﫿＀-￯]")
+
+# Columns packed into the prompt per listing key, in order.
+TABLE_COLUMNS = {
+    "hotels": ("name", "price"),
+    "restaurants": ("name", "rating"),
+    "trains": ("number", "departure", "arrival"),
+}
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        _encoding = False
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.encoding_for_model(OPENAI_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                # The BPE files could not be loaded (e.g. offline); estimate instead.
+                _encoding = False
+    return _encoding
+
+
+def count_tokens(text):
+    """
+    Counts the tokens `text` takes for the configured model with tiktoken.
+    Falls back to an estimate (one token per CJK character, four other
+    characters per token) when tiktoken or its BPE files are unavailable.
+    """
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    cjk = len(_CJK.findall(text))
+    return cjk + -(-(len(text) - cjk) // 4)
+
+
+def _format_value(value):
+    # Missing values (None, NaN, pd.NA) are left blank rather than spelt out.
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def build_prompt(data, destination, start_date, end_date, interests, budget=PROMPT_TOKEN_BUDGET):
+    """
+    Assembles the planning prompt within `budget` tokens.
+
+    Scraped records are ranked against the user's interests and packed as
+    compact pipe-separated tables, one per source and listing kind. Rows
+    are added round-robin across tables, best first, until the budget is
+    spent, so every table gets its top entries before any gets its tail.
+    Returns (prompt, tokens_used).
+    """
+    interests = [interest.strip() for interest in interests if interest.strip()]
+    header = (
+        f"Create a day-by-day trip plan for {destination} from {start_date} to {end_date}.\n"
+        f"The user is interested in {', '.join(interests) or 'general sightseeing'}.\n"
+        "Use the listings below, scraped from travel websites and ranked best first.\n"
+    )
+    missing = data.get("missing") or {}
+    if missing:
+        header += f"No data could be collected from: {', '.join(sorted(missing))}.\n"
+    used = count_tokens(header)
+
+    ranked = rank_tables(data, interests)
+    tables = []
+    for source, listings in ranked.items():
+        if source == "missing" or not listings:
+            continue
+        for key, rows in listings.items():
+            columns = TABLE_COLUMNS.get(key)
+            if columns and rows:
+                tables.append({
+                    "title": f"\n[{source} {key}] {'|'.join(columns)}\n",
+                    "rows": ["|".join(_format_value(row.get(column, "")) for column in columns) + "\n" for row in rows],
+                    "kept": [],
+                })
+
+    while used < budget:
+        added = False
+        for table in tables:
+            if len(table["kept"]) == len(table["rows"]):
+                continue
+            row = table["rows"][len(table["kept"])]
+            cost = count_tokens(row) + (0 if table["kept"] else count_tokens(table["title"]))
+            if used + cost > budget:
+                continue
+            table["kept"].append(row)
+            used += cost
+            added = True
+        if not added:
+            break
+
+    prompt = header + "".join(table["title"] + "".join(table["kept"]) for table in tables if table["kept"])
+    return prompt, count_tokens(prompt)
+
+
+def build_day_prompt(day_plan, destination, interests):
+    """
+    Prompt asking the model to write the prose for one already scheduled
+    day; the timeline itself is fixed and must not change.
+    """
+    interests = [interest.strip() for interest in interests if interest.strip()]
+    return (
+        f"Write a short, friendly description of this day of a trip to {destination} "
+        f"for a traveller interested in {', '.join(interests) or 'general sightseeing'}. "
+        "Keep every time and place exactly as given.\n"
+        f"{day_plan.date} {day_plan.city}\n{day_plan.timeline()}\n"
+    )
@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import re
+
+from config import PLANNER_TOP_K
+from scrapers import records
+
+
+def _minutes(hhmm):
+    hours, _, minutes = str(hhmm).partition(":")
+    try:
+        return int(hours) * 60 + int(minutes or 0)
+    except ValueError:
+        return 24 * 60
+
+
+def _present(value, sign=1.0):
+    # (has a value, signed value): records missing the field rank after every
+    # record that has it, instead of being treated as 0.
+    return (False, 0.0) if value is None else (True, sign * float(value))
+
+
+# Higher is better. Hotels favour lower prices, restaurants higher ratings
+# and trains earlier departures (more of the first day at the destination).
+SCORERS = {
+    "hotel": lambda record: _present(record.get("price"), -1.0),
+    "restaurant": lambda record: _present(record.get("rating")),
+    "train": lambda record: (True, -float(_minutes(record.get("departure")))),
+}
+
+# Offsets for the vectorised ranking in rank_tables, which works on a single
+# float score: an interest match outranks any value, a present value any missing one.
+INTEREST_BONUS = 1e12
+MISSING_PENALTY = 1e9
+
+
+class RecordCollector:
+    """
+    Consumes scraped records one at a time and keeps only the best `top_k`
+    of each (source, kind), so memory stays flat however many listings a
+    source returns.
+    """
+
+    def __init__(self, interests=(), top_k=PLANNER_TOP_K):
+        self.interests = [interest.strip().lower() for interest in interests if interest.strip()]
+        self.top_k = top_k
+        self.missing = {}
+        self.counts = {}
+        self._heaps = {}
+        self._seq = itertools.count()
+
+    def score(self, kind, record):
+        """
+        Scores a record as a tuple compared lexicographically; records
+        mentioning one of the user's interests rank first.
+        """
+        text = " ".join(str(value) for value in record.values()).lower()
+        matches = any(interest in text for interest in self.interests)
+        return (matches, *SCORERS.get(kind, lambda _: (True, 0.0))(record))
+
+    def add(self, source, kind, record):
+        """
+        Feeds one streamed (source, kind, record) tuple into the collector.
+        """
+        if kind == "missing":
+            self.missing[source] = record
+            return
+        key = (source, kind)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        heap = self._heaps.setdefault(key, [])
+        entry = (self.score(kind, record), next(self._seq), record)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heappushpop(heap, entry)
+
+    def to_data(self):
+        """
+        Returns the kept records in the same shape as `orchestrator.scrape_all`,
+        best first within each list.
+        """
+        data = {}
+        for (source, kind), heap in self._heaps.items():
+            ranked = [record for _, _, record in sorted(heap, key=lambda entry: (entry[0], -entry[1]), reverse=True)]
+            data.setdefault(source, {})[f"{kind}s"] = ranked
+        for source in self.missing:
+            data.setdefault(source, None)
+        data["missing"] = dict(self.missing)
+        return data
+
+
+# Vectorised counterparts of SCORERS, as (column, sign) over the typed tables.
+TABLE_SCORES = {
+    "hotels": ("price", -1.0),
+    "restaurants": ("rating", 1.0),
+    "trains": ("departure_min", -1.0),
+}
+
+
+def rank_tables(all_data, interests=(), top_k=PLANNER_TOP_K):
+    """
+    Ranks a fully materialised scrape result with the same scoring as
+    RecordCollector, but vectorised over the typed tables from
+    `scrapers.records`. Returns the best `top_k` per (source, kind) in the
+    `orchestrator.scrape_all` shape.
+    """
+    pattern = "|".join(re.escape(interest.strip().lower()) for interest in interests if interest.strip())
+    data = {}
+    for key, table in records.to_tables(all_data).items():
+        if table.empty:
+            continue
+        column, sign = TABLE_SCORES[key]
+        values = table[column].astype("float64")
+        # Missing values rank after every present one, as in SCORERS.
+        score = values.fillna(0.0) * sign + values.notna().astype("float64") * MISSING_PENALTY
+        if pattern:
+            text = table.drop(columns="source").astype("string").fillna("").agg(" ".join, axis=1).str.lower()
+            score = score + text.str.contains(pattern, regex=True).astype("float64") * INTEREST_BONUS
+        ranked = table.assign(_score=score).sort_values("_score", ascending=False, kind="stable")
+        for source, group in ranked.groupby("source", observed=True, sort=False):
+            columns = [name for name in group.columns if name not in ("source", "_score") and not name.endswith("_min")]
+            data.setdefault(source, {})[key] = group.head(top_k)[columns].astype(object).to_dict("records")
+    for source, value in all_data.items():
+        if source != "missing" and value is None:
+            data.setdefault(source, None)
+    data["missing"] = dict(all_data.get("missing", {}))
+    return data
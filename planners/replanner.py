@@ -0,0 +1,165 @@
+import asyncio
+import itertools
+from dataclasses import dataclass, field, replace
+
+from .scheduler import DaySpec, schedule, schedule_day, haversine_travel
+
+
+@dataclass
+class StructuredPlan:
+    """
+    A scheduled trip together with the inputs it was scheduled from, so it
+    can be adjusted without starting over. `prose` holds the LLM-written
+    text per day (None where not written yet).
+    """
+    days: list
+    pois: list
+    restaurants: list
+    day_plans: list
+    prose: list = field(default_factory=list)
+
+
+@dataclass
+class Change:
+    """
+    A requested adjustment. Kinds:
+
+    - "add_day": insert `spec` (a DaySpec) at `day`; `pois` are pinned to it,
+      e.g. an extra forest day for "想多安排一天森林游玩".
+    - "remove_day": drop day `day`. Its legs move to the next day so the
+      route still connects, POIs pinned to it are unpinned, and every later
+      day is scheduled again so the POIs it held can be placed elsewhere.
+    - "change_day": replace day `day` with `spec` (times, legs, lodging).
+    - "add_poi": schedule each POI in `pois` (on its `day` if pinned,
+      otherwise on the day in its city with the most free time).
+    - "remove_poi": remove the POI called `name`.
+    """
+    kind: str
+    day: int = None
+    spec: DaySpec = None
+    pois: list = field(default_factory=list)
+    name: str = None
+
+
+def build(days, pois, restaurants=(), travel_time=haversine_travel):
+    """
+    Schedules a trip from scratch and wraps it for incremental re-planning.
+    """
+    pois, restaurants = list(pois), list(restaurants)
+    day_plans = schedule(days, pois, restaurants, travel_time)
+    return StructuredPlan(list(days), pois, restaurants, day_plans, [None] * len(days))
+
+
+def _free_minutes(day_plan):
+    return sum(slot.end - slot.start for slot in day_plan.slots if slot.kind == "rest")
+
+
+def _day_of(plan, name):
+    for index, day_plan in enumerate(plan.day_plans):
+        if any(slot.kind == "sight" and slot.activity == name for slot in day_plan.slots):
+            return index
+    return None
+
+
+def _shift_pinned(pois, from_day, delta):
+    return [
+        replace(poi, day=poi.day + delta) if poi.day is not None and poi.day >= from_day else poi
+        for poi in pois
+    ]
+
+
+def affected_days(plan, change):
+    """
+    Returns the new plan's inputs (days, pois) and the indices of the days
+    that have to be scheduled again; every other day is reused as is.
+    """
+    days, pois = list(plan.days), list(plan.pois)
+    if change.kind == "add_day":
+        days.insert(change.day, change.spec)
+        pois = _shift_pinned(pois, change.day, 1)
+        pois += [replace(poi, day=change.day) for poi in change.pois]
+        return days, pois, [change.day]
+    if change.kind == "remove_day":
+        removed = days.pop(change.day)
+        if removed.legs and change.day < len(days):
+            following = days[change.day]
+            days[change.day] = replace(following, legs=list(removed.legs) + list(following.legs))
+        pois = [replace(poi, day=None) if poi.day == change.day else poi for poi in pois]
+        return days, _shift_pinned(pois, change.day + 1, -1), list(range(change.day, len(days)))
+    if change.kind == "change_day":
+        days[change.day] = change.spec
+        return days, pois, [change.day]
+    if change.kind == "add_poi":
+        targets = set()
+        for poi in change.pois:
+            if poi.day is None:
+                candidates = [i for i, day_plan in enumerate(plan.day_plans) if day_plan.city == poi.city]
+                if not candidates:
+                    raise ValueError(f"No day of the trip is spent in {poi.city}")
+                targets.add(max(candidates, key=lambda i: (_free_minutes(plan.day_plans[i]), -i)))
+            else:
+                targets.add(poi.day)
+            pois.append(poi)
+        return days, pois, sorted(targets)
+    if change.kind == "remove_poi":
+        index = _day_of(plan, change.name)
+        pois = [poi for poi in pois if poi.name != change.name]
+        return days, pois, [] if index is None else [index]
+    raise ValueError(f"Unknown change kind: {change.kind}")
+
+
+async def replan(plan, change, write_prose=None, travel_time=haversine_travel):
+    """
+    Applies a change to a structured plan, rescheduling only the affected
+    days and reusing every other day's timeline and prose.
+
+    POIs already placed on unaffected days stay there; affected days are
+    rebuilt from the remaining ones. If `write_prose` (an async callable
+    taking a DayPlan) is given, it is called only for the affected days,
+    concurrently. Returns (new_plan, affected_day_indices).
+    """
+    days, pois, affected = affected_days(plan, change)
+
+    # Carry over the unaffected days, remapping indices around added/removed days.
+    day_plans, prose = list(plan.day_plans), list(plan.prose) or [None] * len(plan.day_plans)
+    if change.kind == "add_day":
+        day_plans.insert(change.day, None)
+        prose.insert(change.day, None)
+    elif change.kind == "remove_day":
+        del day_plans[change.day]
+        del prose[change.day]
+
+    used = {
+        slot.activity
+        for index, day_plan in enumerate(day_plans)
+        if index not in affected and day_plan is not None
+        for slot in day_plan.slots
+        if slot.kind == "sight"
+    }
+    if change.kind == "remove_poi":
+        used.discard(change.name)
+    ordered = sorted(pois, key=lambda poi: (-poi.priority, poi.name))
+    for index in affected:
+        # Restaurants are used in turn, one per meal served, as in schedule().
+        offset = sum(1 for day_plan in day_plans[:index] if day_plan is not None
+                     for slot in day_plan.slots if slot.kind == "meal")
+        restaurants = itertools.islice(itertools.cycle(plan.restaurants), offset, None) if plan.restaurants else iter(())
+        day_plans[index] = schedule_day(index, days[index], ordered, restaurants, used, travel_time)
+        prose[index] = None
+
+    # Sights the old plan had that the new one lost (other than a removed POI).
+    before = [slot.activity for day_plan in plan.day_plans for slot in day_plan.slots if slot.kind == "sight"]
+    placed = {slot.activity for day_plan in day_plans for slot in day_plan.slots if slot.kind == "sight"}
+    reason = f"删除第 {change.day + 1} 天后" if change.kind == "remove_day" else "调整行程后"
+    lost = [f"{name}：{reason}未能重新安排" for name in before
+            if name not in placed and not (change.kind == "remove_poi" and name == change.name)]
+    if lost and day_plans:
+        # A copy: the last day may be carried over from the old plan.
+        day_plans[-1] = replace(day_plans[-1], warnings=day_plans[-1].warnings + lost)
+
+    if write_prose is not None and affected:
+        written = await asyncio.gather(*(write_prose(day_plans[index]) for index in affected))
+        for index, text in zip(affected, written):
+            prose[index] = text
+
+    return StructuredPlan(days, pois, plan.restaurants, day_plans, prose), affected
@@ -0,0 +1,341 @@
+import itertools
+import math
+from dataclasses import dataclass, field
+
+# Meal windows as (name, earliest start, latest start, duration) in minutes.
+MEALS = (
+    ("早餐", 7 * 60, 9 * 60 + 30, 40),
+    ("午餐", 11 * 60 + 30, 13 * 60 + 30, 60),
+    ("晚餐", 17 * 60 + 30, 19 * 60 + 30, 70),
+)
+# Average door-to-door speed (km/h) and fixed overhead (min) for local moves.
+LOCAL_SPEED_KMH = 25.0
+LOCAL_OVERHEAD_MIN = 10
+DEFAULT_TRAVEL_MIN = 20
+# A meal pushed past its window by a fixed item may start this late (minutes).
+LATE_MEAL_GRACE = 90
+
+
+def to_minutes(hhmm):
+    """
+    Converts "HH:MM" to minutes past midnight; minutes pass through unchanged.
+    """
+    if isinstance(hhmm, int):
+        return hhmm
+    hours, _, minutes = hhmm.strip().partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def to_hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+@dataclass(slots=True)
+class POI:
+    """
+    A sight or activity. `fixed_start` pins it to a time (e.g. the 14:00
+    crane release show); `day` pins it to one day of the trip. A POI with a
+    `fixed_start` but no `day` goes to the first day that visits its city.
+    """
+    name: str
+    city: str
+    duration: int
+    opens: int = 0
+    closes: int = 24 * 60
+    priority: int = 0
+    lat: float = None
+    lng: float = None
+    fixed_start: int = None
+    day: int = None
+
+
+@dataclass(slots=True)
+class Leg:
+    """
+    An inter-city move. Legs without `depart` leave after breakfast.
+    """
+    origin: str
+    destination: str
+    duration: int
+    mode: str = "自驾"
+    depart: int = None
+
+
+@dataclass(slots=True)
+class DaySpec:
+    date: str
+    city: str
+    start: int = 8 * 60
+    end: int = 21 * 60
+    legs: list = field(default_factory=list)
+    lodging: str = None
+
+
+@dataclass(slots=True)
+class Slot:
+    start: int
+    end: int
+    activity: str
+    kind: str
+
+
+@dataclass(slots=True)
+class DayPlan:
+    date: str
+    city: str
+    slots: list
+    lodging: str = None
+    # Meals that had to move or be dropped, fixed items that could not be kept.
+    warnings: list = field(default_factory=list)
+
+    def timeline(self):
+        """
+        Renders the day as "HH:MM - activity" lines.
+        """
+        return "\n".join(f"- {to_hhmm(slot.start)} {slot.activity}" for slot in self.slots)
+
+
+def haversine_travel(a, b):
+    """
+    Estimates local travel minutes between two POIs from their coordinates;
+    falls back to DEFAULT_TRAVEL_MIN when either has none.
+    """
+    if a is None or b is None or a.lat is None or b.lat is None:
+        return DEFAULT_TRAVEL_MIN
+    lat1, lng1, lat2, lng2 = map(math.radians, (a.lat, a.lng, b.lat, b.lng))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    km = 2 * 6371.0 * math.asin(math.sqrt(h))
+    return LOCAL_OVERHEAD_MIN + round(km / LOCAL_SPEED_KMH * 60)
+
+
+def _leg_label(leg):
+    return f"{leg.mode} {leg.origin} → {leg.destination}"
+
+
+def schedule_day(index, day, pois, restaurants, used, travel_time=haversine_travel):
+    """
+    Schedules day `index` of a trip. POIs whose names are in `used` are
+    skipped and the ones scheduled here are added to it; `restaurants` is
+    an iterator of restaurant names consumed by the meals.
+    """
+    slots = []
+    warnings = []
+    anchors = []  # [start, Leg or POI]; start is None for legs leaving after breakfast
+    city = day.city
+    cities = {day.city, *(leg.destination for leg in day.legs)}
+    t = day.start
+
+    for leg in day.legs:
+        anchors.append([leg.depart, leg])
+    for poi in pois:
+        if poi.fixed_start is None or poi.name in used:
+            continue
+        if poi.day == index or (poi.day is None and poi.city in cities):
+            anchors.append([poi.fixed_start, poi])
+
+    meals = [meal for meal in MEALS if meal[2] >= day.start]
+
+    def eat(now, deadline=None):
+        # Serve the next meal once its window has opened, unless it would run
+        # into `deadline`. A meal held up past its window starts late (noted)
+        # within LATE_MEAL_GRACE, and is dropped with a warning after that or
+        # once the following meal's window opens.
+        while meals and meals[0][1] <= now:
+            name, earliest, latest, duration = meals[0]
+            if now > latest + LATE_MEAL_GRACE or (len(meals) > 1 and now >= meals[1][1]):
+                meals.pop(0)
+                warnings.append(f"错过{name}（{to_hhmm(earliest)}-{to_hhmm(latest)}）")
+                continue
+            if deadline is not None and now + duration > deadline:
+                return now
+            meals.pop(0)
+            place = next(restaurants, None)
+            label = f"{name}（{place}）" if place else name
+            if now > latest:
+                label += "（推迟）"
+            slots.append(Slot(now, now + duration, label, "meal"))
+            return now + duration
+        return now
+
+    def reserve(item, origin):
+        # Travel time to keep free before a fixed item; legs start where we are.
+        return travel_time(origin, item) if isinstance(item, POI) else 0
+
+    def fixed_anchors():
+        return sorted((a for a in anchors if a[0] is not None), key=lambda a: a[0])
+
+    # Legs with no set departure leave after breakfast, in order.
+    t = eat(t)
+    for anchor in [a for a in anchors if a[0] is None]:
+        leg = anchor[1]
+        slots.append(Slot(t, t + leg.duration, _leg_label(leg), "leg"))
+        t += leg.duration
+        city = leg.destination
+        anchors.remove(anchor)
+
+    def meal_first(anchor, now, origin):
+        # The pending meal if it fits between `now` and the anchor (after
+        # travelling on to it), so the time for it must be kept free.
+        if not meals:
+            return None
+        _, earliest, latest, duration = meals[0]
+        start = max(now, earliest)
+        if anchor is None:
+            return meals[0] if start <= latest else None
+        if start + duration + reserve(anchor[1], origin) <= anchor[0]:
+            return meals[0]
+        return None
+
+    position = None
+    while t < day.end:
+        upcoming = fixed_anchors()
+        next_anchor = upcoming[0] if upcoming else None
+        t = eat(t, next_anchor[0] - reserve(next_anchor[1], position) if next_anchor else None)
+        limit = next_anchor[0] if next_anchor else day.end
+        meal = meal_first(next_anchor, t, position)
+
+        best = None
+        for poi in pois:
+            if poi.name in used or poi.city != city or poi.fixed_start is not None:
+                continue
+            if poi.day is not None and poi.day != index:
+                continue
+            arrive = t + travel_time(position, poi)
+            start = max(arrive, poi.opens)
+            end = start + poi.duration
+            if end > poi.closes or end > day.end:
+                continue
+            # POIs must finish in time for the pending meal to start within
+            # its window and, before a fixed item, to be eaten before it.
+            if meal is not None and end > meal[2]:
+                continue
+            after = max(end, meal[1]) + meal[3] if meal is not None and next_anchor else end
+            if next_anchor and after + reserve(next_anchor[1], poi) > limit:
+                continue
+            rank = (-poi.priority, end, poi.name)
+            if best is None or rank < best[0]:
+                best = (rank, poi, arrive, start, end)
+
+        if best is not None:
+            _, poi, arrive, start, end = best
+            if arrive > t:
+                slots.append(Slot(t, arrive, f"前往{poi.name}", "move"))
+            slots.append(Slot(start, end, poi.name, "sight"))
+            used.add(poi.name)
+            position, t = poi, end
+            continue
+
+        if next_anchor is None:
+            # Nothing left to do before the next meal: rest until it opens.
+            later = [meal for meal in meals if t < meal[1] < day.end]
+            if not later:
+                break
+            slots.append(Slot(t, later[0][1], "自由活动 / 休整", "rest"))
+            t = later[0][1]
+            continue
+        if meal is not None and t < meal[1]:
+            # The meal fits before the fixed item: rest until its window opens.
+            slots.append(Slot(t, meal[1], "自由活动 / 休整", "rest"))
+            t = meal[1]
+            continue
+        # Nothing fits before the next fixed item: go straight to it.
+        start, item = next_anchor
+        anchors.remove(next_anchor)
+        if isinstance(item, Leg):
+            if t > start:
+                warnings.append(f"{_leg_label(item)} 计划 {to_hhmm(start)} 出发，实际最早 {to_hhmm(t)}")
+            elif t < start:
+                slots.append(Slot(t, start, "候车 / 准备出发", "move"))
+                t = start
+            slots.append(Slot(t, t + item.duration, _leg_label(item), "leg"))
+            t += item.duration
+            city, position = item.destination, None
+            continue
+        # A POI without a day may still fit a later day; schedule() reports
+        # it if no day manages to.
+        if item.city != city:
+            if item.day is not None:
+                warnings.append(f"{to_hhmm(start)} {item.name} 不在当时所在城市（{city}），未安排")
+            continue
+        arrive = t + reserve(item, position)
+        if arrive > start:
+            if item.day is not None:
+                warnings.append(f"赶不上 {to_hhmm(start)} {item.name}（最早 {to_hhmm(arrive)} 到达），未安排")
+            continue
+        slots.append(Slot(t, start, f"前往{item.name}", "move"))
+        slots.append(Slot(start, start + item.duration, item.name, "sight"))
+        used.add(item.name)
+        t, position = start + item.duration, item
+
+    for start, item in fixed_anchors():
+        if isinstance(item, POI) and item.day is None:
+            continue
+        warnings.append(f"{to_hhmm(start)} {item.name if isinstance(item, POI) else _leg_label(item)} 超出当天结束时间，未安排")
+    t = eat(t)
+    if day.lodging:
+        slots.append(Slot(max(t, day.start), max(t, day.start), f"入住 {day.lodging}", "lodging"))
+    return DayPlan(day.date, city, slots, day.lodging, warnings)
+
+
+def schedule(days, pois, restaurants=(), travel_time=haversine_travel):
+    """
+    Assigns POIs, meals, lodging and inter-city legs into one timeline per day.
+
+    Each day starts with breakfast and any legs without a departure time,
+    then repeatedly picks the feasible POI in the current city with the
+    highest priority that finishes earliest, respecting opening windows,
+    travel time from the previous stop, the travel time on to the next
+    fixed-time item (a timed leg or a POI with `fixed_start`) and the
+    latest start of the next meal, which is served once its window opens.
+    Before a fixed-time item the next meal's time is kept free whenever it
+    fits. Meals pushed late, fixed items that cannot be kept and fixed-time
+    POIs without a day that no day manages to place are reported in
+    DayPlan.warnings. All ties
+    break on names, so identical inputs always give identical output.
+    """
+    pois = sorted(pois, key=lambda poi: (-poi.priority, poi.name))
+    # Restaurants are used in turn across the whole trip.
+    restaurants = itertools.cycle(list(restaurants)) if restaurants else iter(())
+    used = set()
+    plans = [schedule_day(index, day, pois, restaurants, used, travel_time) for index, day in enumerate(days)]
+    for poi in pois:
+        if not plans or poi.fixed_start is None or poi.day is not None or poi.name in used:
+            continue
+        visits = [i for i, day in enumerate(days) if poi.city in {day.city, *(leg.destination for leg in day.legs)}]
+        if visits:
+            plans[visits[-1]].warnings.append(f"赶不上 {to_hhmm(poi.fixed_start)} {poi.name}（{poi.city}），未安排")
+        else:
+            plans[-1].warnings.append(f"{to_hhmm(poi.fixed_start)} {poi.name}：行程不经过{poi.city}，未安排")
+    return plans
+
+
+def format_plan(plans):
+    """
+    Renders a scheduled trip in the Day N / timeline layout of the handbooks.
+    """
+    sections = []
+    for number, plan in enumerate(plans, start=1):
+        lines = [f"### Day {number}: {plan.city}", f"**{plan.date}**"]
+        if plan.lodging:
+            lines.append(f"**住宿:** {plan.lodging}")
+        lines += ["**详细时间线:**", plan.timeline()]
+        if plan.warnings:
+            lines += ["**提示:**"] + [f"- {warning}" for warning in plan.warnings]
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def schedule_scraped(days, pois, all_data, travel_time=haversine_travel):
+    """
+    Schedules a trip using scraped listings: restaurants (in ranked order)
+    fill the meals and the top-ranked hotel is used for days without lodging.
+    """
+    restaurants, hotels = [], []
+    for source, data in all_data.items():
+        if source == "missing" or not isinstance(data, dict):
+            continue
+        restaurants += [item["name"] for item in data.get("restaurants", [])]
+        hotels += [item["name"] for item in data.get("hotels", [])]
+    if hotels:
+        days = [day if day.lodging else DaySpec(day.date, day.city, day.start, day.end, day.legs, hotels[0]) for day in days]
+    return schedule(days, pois, restaurants, travel_time)
@@ -1,27 +1,113 @@
-import openai
-from config import OPENAI_API_KEY
+import hashlib
+import json
+import re
+
+from singleflight import SingleFlight
+from config import PLAN_CACHE_SEMANTIC
+from . import llm
+from .plan_cache import PlanCache, normalize, openai_embed
+from .prompt_builder import build_day_prompt, build_prompt
+
+# Generated plans, shared by every caller in the process.
+plan_cache = PlanCache(embed=openai_embed if PLAN_CACHE_SEMANTIC else None)
+# Concurrent identical requests share one generation.
+plan_flights = SingleFlight()
+
+# A line starting a new day, e.g. "Day 2", "## Day 2:" or "第二天".
+DAY_HEADER = re.compile(r"^[#*\s]*(Day\s*\d+|第[一二三四五六七八九十\d]+天)", re.IGNORECASE | re.MULTILINE)
+
+
+async def split_days(deltas):
+    """
+    Regroups a stream of text deltas into day-sized chunks: text is held
+    back until the next day header arrives, then released up to it.
+    """
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        # Only headers at a line start can be complete; keep the last
+        # (possibly partial) line in the buffer.
+        complete = buffer.rfind("\n") + 1
+        headers = [match.start() for match in DAY_HEADER.finditer(buffer, 0, complete) if match.start() > 0]
+        if headers:
+            yield buffer[:headers[-1]]
+            buffer = buffer[headers[-1]:]
+    if buffer:
+        yield buffer
+
+
+def data_digest(data):
+    """
+    A short digest of the scraped data, so requests with different listings
+    never share a generation or a cached plan.
+    """
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+async def _dummy_completion(text):
+    yield text
+
+
+async def _generate(data, digest, destination, start_date, end_date, interests):
+    print("Generating trip plan...")
+
+    # Prepare the prompt for the OpenAI API; the scraped listings are ranked
+    # and trimmed to PROMPT_TOKEN_BUDGET so prompt size stays bounded.
+    prompt, _ = build_prompt(data, destination, start_date, end_date, interests)
+
+    backend = llm.get_backend()
+    if backend is not None:
+        deltas = backend.stream(prompt)
+    else:
+        # Without an API key, we return a dummy plan.
+        deltas = _dummy_completion(f"Trip plan for {destination} based on your interests: {', '.join(interests)}")
+
+    chunks = []
+    async for chunk in split_days(deltas):
+        chunks.append(chunk)
+        yield chunk
+
+    trip_plan = "".join(chunks).strip()
+    # A plan made while sources were missing is not kept for later requests.
+    if not data.get("missing"):
+        await plan_cache.put(destination, start_date, end_date, interests, trip_plan, digest)
+
+
+async def plan_stream(data, destination, start_date, end_date, interests):
+    """
+    Generates a trip plan using the scraped data and user's interests,
+    yielding it day by day as the model writes it. Concurrent identical
+    requests with the same scraped data share one generation; the plan
+    cache uses the same key.
+    """
+    digest = data_digest(data)
+    cached = await plan_cache.get(destination, start_date, end_date, interests, digest)
+    if cached is not None:
+        yield cached
+        return
+
+    key = (normalize(destination, start_date, end_date, interests), digest)
+    async for chunk in plan_flights.stream(key, lambda: _generate(data, digest, destination, start_date, end_date, interests)):
+        yield chunk
 
-openai.api_key = OPENAI_API_KEY
 
 async def plan(data, destination, start_date, end_date, interests):
     """
     Generates a trip plan using the scraped data and user's interests.
     This is where you can leverage the power of GitHub Copilot to generate a personalized itinerary.
     """
-    print("Generating trip plan...")
+    return "".join([chunk async for chunk in plan_stream(data, destination, start_date, end_date, interests)]).strip()
 
-    # Prepare the prompt for the OpenAI API
-    prompt = f"Create a trip plan for {destination} from {start_date} to {end_date}. \
-              The user is interested in {', '.join(interests)}. \
-              Here is some data scraped from travel websites: {data}"
-
-    # In a real implementation, you would make a call to the OpenAI API.
-    # For this example, we'll return a dummy plan.
-    # response = openai.Completion.create(
-    #     engine="text-davinci-003",
-    #     prompt=prompt,
-    #     max_tokens=1024
-    # )
-    # return response.choices[0].text.strip()
-
-    return f"Trip plan for {destination} based on your interests: {', '.join(interests)}"
+
+async def write_day_prose(day_plan, destination, interests=()):
+    """
+    Has the model write the narrative for one scheduled day (see
+    planners.scheduler); the timeline itself comes from the scheduler.
+    """
+    backend = llm.get_backend()
+    if backend is None:
+        # Without an API key, the timeline is the prose.
+        return day_plan.timeline()
+    prompt = build_day_prompt(day_plan, destination, interests)
+    return "".join([delta async for delta in backend.stream(prompt)]).strip()
@@ -1 +1,2 @@
 from . import ctrip_scraper, hsr_scraper, dianping_scraper
+from . import browser_pool, cache, conditional, http_client, orchestrator, rate_limiter, records
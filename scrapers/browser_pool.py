@@ -0,0 +1,217 @@
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode, urlsplit
+
+from playwright.async_api import async_playwright, Error as PlaywrightError
+
+from config import (
+    HEADLESS_BROWSER,
+    BROWSER_POOL_SIZE,
+    BROWSER_PAGES_PER_CONTEXT,
+    BROWSER_NAVIGATION_TIMEOUT,
+    BROWSER_BLOCKED_RESOURCE_TYPES,
+    BROWSER_BLOCKED_HOSTS,
+    HTTP_USER_AGENT,
+    HTTP_MAX_RETRIES,
+    HTTP_THROTTLE_STATUSES,
+    CAPTCHA_MARKERS,
+)
+from . import rate_limiter
+from .http_client import ThrottledError
+
+
+class BrowserPool:
+    """
+    Keeps one warm Chromium instance and a fixed number of browser contexts
+    that scrapers check pages out of.
+
+    Each context is recycled after `pages_per_context` pages to bound memory
+    growth, and is discarded and rebuilt only if it closes or the browser
+    crashes; navigation errors and timeouts leave it in the pool.
+    Requests for images, fonts, media and known ad hosts are aborted.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, pages_per_context=BROWSER_PAGES_PER_CONTEXT,
+                 blocked_resource_types=BROWSER_BLOCKED_RESOURCE_TYPES,
+                 blocked_hosts=BROWSER_BLOCKED_HOSTS, headless=HEADLESS_BROWSER):
+        self.size = size
+        self.pages_per_context = pages_per_context
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_hosts = tuple(blocked_hosts)
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = asyncio.Lock()
+        self._slots = None
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            if self._browser is not None:
+                print("Browser disconnected, relaunching...")
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            return self._browser
+
+    async def _block(self, route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if request.resource_type in self.blocked_resource_types or host.endswith(self.blocked_hosts):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _new_context(self):
+        browser = await self._ensure_browser()
+        context = await browser.new_context(user_agent=HTTP_USER_AGENT)
+        context.set_default_navigation_timeout(BROWSER_NAVIGATION_TIMEOUT * 1000)
+        await context.route("**/*", self._block)
+        return context
+
+    def _watch(self, slot, context):
+        # Marks the slot once its context goes away (crash or browser exit).
+        def on_close(_):
+            if slot["context"] is context:
+                slot["closed"] = True
+
+        context.on("close", on_close)
+
+    def _healthy(self, slot):
+        return (slot["context"] is not None and not slot.get("closed")
+                and self._browser is not None and self._browser.is_connected())
+
+    async def _discard(self, slot):
+        context, slot["context"], slot["served"], slot["closed"] = slot["context"], None, 0, False
+        if context is not None:
+            try:
+                await context.close()
+            except PlaywrightError:
+                pass  # Already gone with a crashed browser
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Checks a fresh page out of the pool; it is closed on exit.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Queue()
+            for _ in range(self.size):
+                self._slots.put_nowait({"context": None, "served": 0})
+
+        slots = self._slots
+        slot = await slots.get()
+        try:
+            if slot["context"] is not None and not self._healthy(slot):
+                await self._discard(slot)
+            if slot["context"] is None:
+                slot["context"] = await self._new_context()
+                self._watch(slot, slot["context"])
+            page = await slot["context"].new_page()
+            try:
+                yield page
+            finally:
+                slot["served"] += 1
+                try:
+                    await page.close()
+                except PlaywrightError:
+                    pass
+            if slot["served"] >= self.pages_per_context:
+                await self._discard(slot)
+        except PlaywrightError:
+            # Timeouts and failed navigations (DNS, refused connections) leave
+            # the context usable; rebuild only if it or the browser is gone.
+            if not self._healthy(slot):
+                await self._discard(slot)
+            raise
+        finally:
+            if self._slots is slots:
+                slots.put_nowait(slot)
+            else:
+                # The pool was closed while this page was out; don't return
+                # the slot to a queue nobody will drain.
+                await self._discard(slot)
+
+    async def close(self):
+        """
+        Closes every context, the browser and the Playwright driver. Pages
+        still checked out keep working until released, then their contexts
+        are discarded instead of being returned to the pool.
+        """
+        if self._slots is not None:
+            while not self._slots.empty():
+                await self._discard(self._slots.get_nowait())
+            self._slots = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_pool = None
+
+
+def get_pool():
+    """
+    Returns the process-wide browser pool.
+    """
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+def is_throttled(response, html):
+    """
+    Returns True if a navigation was throttled: a 429/403 main response or
+    a captcha challenge rendered in place of the content.
+    """
+    if response is not None and response.status in HTTP_THROTTLE_STATUSES:
+        return True
+    head = html[:4096].lower()
+    return any(marker in head for marker in CAPTCHA_MARKERS)
+
+
+async def _load(url):
+    async with get_pool().page() as page:
+        response = await page.goto(url, wait_until="networkidle")
+        return response, await page.content()
+
+
+async def fetch_html(url, params=None, source=None):
+    """
+    Loads a page in a pooled browser and returns the rendered HTML.
+
+    When `source` is given the navigation goes through that source's
+    adaptive rate limiter, as in http_client.request: throttling responses
+    and captcha pages slow the source down and are retried with backoff.
+    """
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    if source is None:
+        return (await _load(url))[1]
+
+    limiter = rate_limiter.get_limiter(source)
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        await limiter.acquire()
+        response, html = await _load(url)
+        if not is_throttled(response, html):
+            limiter.on_success()
+            return html
+        delay = limiter.on_throttle()
+        status = response.status if response is not None else "captcha"
+        print(f"{source} throttled in browser ({status}), backing off {delay:.1f}s")
+    raise ThrottledError(f"{source} still throttled after {HTTP_MAX_RETRIES} retries: {url}")
+
+
+async def close():
+    """
+    Shuts down the process-wide pool if it was started.
+    """
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
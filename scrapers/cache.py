@@ -0,0 +1,249 @@
+import asyncio
+import functools
+import json
+import os
+import sqlite3
+import time
+
+from singleflight import SingleFlight
+from config import (
+    SCRAPE_CACHE_PATH,
+    SCRAPE_CACHE_MAX_BYTES,
+    SCRAPE_CACHE_TTL,
+    SCRAPE_CACHE_DEFAULT_TTL,
+    SCRAPE_CACHE_STALE_TTL,
+)
+
+_conn = None
+_refreshing = {}
+# Concurrent misses for the same key share one scrape.
+flights = SingleFlight()
+
+
+def _db():
+    """
+    Returns the cache database connection, creating the schema on first use.
+    """
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(SCRAPE_CACHE_PATH), exist_ok=True)
+        _conn = sqlite3.connect(SCRAPE_CACHE_PATH)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_cache ("
+            " key TEXT PRIMARY KEY,"
+            " source TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS scrape_cache_lru ON scrape_cache (accessed_at)")
+        # Conditional-request validators and parsed records per listing page
+        # (scrapers.conditional); they count against the same size cap.
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_validators ("
+            " key TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " content_hash TEXT NOT NULL,"
+            " parsed TEXT NOT NULL,"
+            " checked_at REAL NOT NULL,"
+            " size INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in _conn.execute("PRAGMA table_info(page_validators)")}
+        if "size" not in columns:
+            # Tables created before validators were size-capped.
+            _conn.execute("ALTER TABLE page_validators ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            _conn.execute("UPDATE page_validators SET size = LENGTH(parsed)")
+        _conn.execute("CREATE INDEX IF NOT EXISTS page_validators_lru ON page_validators (checked_at)")
+        _conn.commit()
+    return _conn
+
+
+def make_key(source, destination, start_date=None, end_date=None, params=None):
+    """
+    Builds the cache key for a scrape; the destination is normalised so that
+    trivially different spellings share an entry.
+    """
+    return json.dumps(
+        [source, destination.strip().lower(), start_date, end_date, params or {}],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+
+
+def get(key):
+    """
+    Returns (value, age_in_seconds) for a cached entry, or None on a miss.
+    """
+    db = _db()
+    row = db.execute("SELECT value, stored_at FROM scrape_cache WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    now = time.time()
+    db.execute("UPDATE scrape_cache SET accessed_at = ? WHERE key = ?", (now, key))
+    db.commit()
+    return json.loads(row[0]), now - row[1]
+
+
+def put(key, source, value):
+    """
+    Stores a scrape result and evicts least recently used entries over the size cap.
+    """
+    payload = json.dumps(value, ensure_ascii=False)
+    now = time.time()
+    db = _db()
+    db.execute(
+        "INSERT OR REPLACE INTO scrape_cache (key, source, value, size, stored_at, accessed_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        (key, source, payload, len(payload), now, now),
+    )
+    _evict(db)
+    db.commit()
+
+
+def _evict(db):
+    """
+    Drops least recently used scrape entries and page validators until both
+    tables together fit in SCRAPE_CACHE_MAX_BYTES.
+    """
+    total = db.execute(
+        "SELECT (SELECT COALESCE(SUM(size), 0) FROM scrape_cache)"
+        " + (SELECT COALESCE(SUM(size), 0) FROM page_validators)"
+    ).fetchone()[0]
+    if total <= SCRAPE_CACHE_MAX_BYTES:
+        return
+    doomed = {"scrape_cache": [], "page_validators": []}
+    rows = db.execute(
+        "SELECT 'scrape_cache', key, size, accessed_at FROM scrape_cache"
+        " UNION ALL SELECT 'page_validators', key, size, checked_at FROM page_validators"
+        " ORDER BY 4"
+    )
+    for table, key, size, _ in rows:
+        if total <= SCRAPE_CACHE_MAX_BYTES:
+            break
+        doomed[table].append((key,))
+        total -= size
+    db.executemany("DELETE FROM scrape_cache WHERE key = ?", doomed["scrape_cache"])
+    db.executemany("DELETE FROM page_validators WHERE key = ?", doomed["page_validators"])
+
+
+def clear():
+    """
+    Drops every cached entry and page validator.
+    """
+    db = _db()
+    db.execute("DELETE FROM scrape_cache")
+    db.execute("DELETE FROM page_validators")
+    db.commit()
+
+
+def _refresh(key, source, fetch):
+    """
+    Schedules a background refresh for a stale entry, at most one per key.
+    """
+    if key in _refreshing:
+        return
+
+    async def run():
+        try:
+            put(key, source, await fetch())
+        except Exception as e:
+            print(f"Background refresh of {source} failed: {type(e).__name__}: {e}")
+        finally:
+            _refreshing.pop(key, None)
+
+    _refreshing[key] = asyncio.create_task(run())
+
+
+async def wait_for_refreshes():
+    """
+    Waits for any background refreshes still in flight.
+    """
+    while _refreshing:
+        await asyncio.gather(*list(_refreshing.values()), return_exceptions=True)
+
+
+def cached(source):
+    """
+    Decorator that puts the on-disk cache in front of a scraper's `scrape()`.
+
+    Fresh entries are returned directly. Entries past their TTL but within
+    SCRAPE_CACHE_STALE_TTL are returned immediately while a background task
+    re-scrapes and replaces them (stale-while-revalidate). Concurrent
+    misses for the same key share a single scrape.
+    """
+    ttl = SCRAPE_CACHE_TTL.get(source, SCRAPE_CACHE_DEFAULT_TTL)
+
+    def decorator(scrape):
+        @functools.wraps(scrape)
+        async def wrapper(destination, start_date=None, end_date=None, **params):
+            key = make_key(source, destination, start_date, end_date, params)
+            fetch = functools.partial(scrape, destination, start_date, end_date, **params)
+            entry = get(key)
+            if entry is not None:
+                value, age = entry
+                if age < ttl:
+                    return value
+                if age < ttl + SCRAPE_CACHE_STALE_TTL:
+                    _refresh(key, source, fetch)
+                    return value
+
+            async def fetch_and_store():
+                value = await fetch()
+                put(key, source, value)
+                return value
+
+            return await flights.do(key, fetch_and_store)
+
+        return wrapper
+
+    return decorator
+
+
+def cached_stream(source, kind):
+    """
+    Decorator that puts the same cache in front of a scraper's `stream()`,
+    so the streaming entry points and `scrape()` share entries.
+
+    Fresh entries are replayed as (kind, record) pairs. Stale entries within
+    SCRAPE_CACHE_STALE_TTL are replayed too while a background task
+    re-scrapes them. On a miss the live records are streamed through and,
+    once the stream completes, stored as {f"{kind}s": [...]}; a stream that
+    fails part way stores nothing. Concurrent misses for the same key share
+    one scrape, which keeps running if a caller gives up.
+    """
+    ttl = SCRAPE_CACHE_TTL.get(source, SCRAPE_CACHE_DEFAULT_TTL)
+    field = f"{kind}s"
+
+    def decorator(stream):
+        async def collect(destination, start_date=None, end_date=None, **params):
+            return {field: [record async for _, record in stream(destination, start_date, end_date, **params)]}
+
+        @functools.wraps(stream)
+        async def wrapper(destination, start_date=None, end_date=None, **params):
+            key = make_key(source, destination, start_date, end_date, params)
+            entry = get(key)
+            if entry is not None:
+                value, age = entry
+                if age < ttl + SCRAPE_CACHE_STALE_TTL:
+                    if age >= ttl:
+                        _refresh(key, source, functools.partial(collect, destination, start_date, end_date, **params))
+                    for record in value[field]:
+                        yield kind, record
+                    return
+
+            async def fetch_and_store():
+                records = []
+                async for record_kind, record in stream(destination, start_date, end_date, **params):
+                    records.append(record)
+                    yield record_kind, record
+                put(key, source, {field: records})
+
+            async for item in flights.stream(key, fetch_and_store):
+                yield item
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import json
+import time
+from urllib.parse import urlencode
+
+from config import USE_BROWSER_POOL
+from . import browser_pool, cache, http_client
+
+
+def _db():
+    """
+    Returns the scrape cache database, which holds the page_validators
+    table and evicts from it under the same size cap.
+    """
+    return cache._db()
+
+
+def page_key(url, params=None):
+    """
+    Identifies a page by its URL and sorted query parameters.
+    """
+    return f"{url}?{urlencode(sorted((params or {}).items()))}"
+
+
+def lookup(key):
+    """
+    Returns the stored validators and parsed records for a page, or None.
+    """
+    row = _db().execute(
+        "SELECT etag, last_modified, content_hash, parsed FROM page_validators WHERE key = ?", (key,)
+    ).fetchone()
+    if row is None:
+        return None
+    return {"etag": row[0], "last_modified": row[1], "content_hash": row[2], "parsed": json.loads(row[3])}
+
+
+def store(key, content_hash, parsed, etag=None, last_modified=None):
+    payload = json.dumps(parsed, ensure_ascii=False)
+    db = _db()
+    db.execute(
+        "INSERT OR REPLACE INTO page_validators (key, etag, last_modified, content_hash, parsed, checked_at, size)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (key, etag, last_modified, content_hash, payload, time.time(), len(payload)),
+    )
+    cache._evict(db)
+    db.commit()
+
+
+def touch(key, etag=None, last_modified=None):
+    """
+    Marks an unchanged page as checked now, keeping its stored records;
+    validators are only replaced when the server sent new ones.
+    """
+    db = _db()
+    db.execute(
+        "UPDATE page_validators SET checked_at = ?, etag = COALESCE(?, etag),"
+        " last_modified = COALESCE(?, last_modified) WHERE key = ?",
+        (time.time(), etag, last_modified, key),
+    )
+    db.commit()
+
+
+async def parse_if_changed(key, html, parse, etag=None, last_modified=None):
+    """
+    Parses `html` unless its hash matches the last fetch of the same page,
+    in which case the previously extracted records are returned without
+    parsing. Parsing runs in a worker thread so that it does not block the
+    event loop.
+    """
+    content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    stored = lookup(key)
+    if stored is not None and stored["content_hash"] == content_hash:
+        touch(key, etag, last_modified)
+        return stored["parsed"]
+    parsed = await asyncio.to_thread(parse, html)
+    store(key, content_hash, parsed, etag, last_modified)
+    return parsed
+
+
+async def fetch_parsed(url, parse, params=None, source=None):
+    """
+    Fetches a listing page with a conditional request and returns its
+    parsed records.
+
+    The stored ETag / Last-Modified validators are sent as If-None-Match /
+    If-Modified-Since. On a 304, or when the body hashes the same as last
+    time, the records extracted on the previous run are reused and the page
+    is not parsed again.
+    """
+    key = page_key(url, params)
+    stored = lookup(key)
+    headers = {}
+    if stored is not None:
+        if stored["etag"]:
+            headers["If-None-Match"] = stored["etag"]
+        if stored["last_modified"]:
+            headers["If-Modified-Since"] = stored["last_modified"]
+
+    resp = await http_client.get(url, source=source, params=params, headers=headers)
+    if resp.status_code == 304 and stored is not None:
+        touch(key)
+        return stored["parsed"]
+    resp.raise_for_status()
+    return await parse_if_changed(
+        key, resp.text, parse,
+        etag=resp.headers.get("etag"), last_modified=resp.headers.get("last-modified"),
+    )
+
+
+async def fetch_listing(url, parse, params=None, source=None):
+    """
+    Returns the parsed records of one listing page. Pages are rendered in a
+    warm pooled browser when JS rendering is enabled, and otherwise fetched
+    through the shared pooled HTTP client with a conditional request.
+    Unchanged pages reuse the records extracted last time.
+    """
+    if USE_BROWSER_POOL:
+        html = await browser_pool.fetch_html(url, params, source=source)
+        return await parse_if_changed(page_key(url, params), html, parse)
+    return await fetch_parsed(url, parse, params=params, source=source)
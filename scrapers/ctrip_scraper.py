@@ -1,11 +1,63 @@
 import asyncio
 
-async def scrape(destination):
+from bs4 import BeautifulSoup
+
+from config import SCRAPER_BASE_URLS, SCRAPER_MAX_PAGES
+from . import cache, conditional
+
+SOURCE = "ctrip"
+
+
+def parse(html):
     """
-    Scrapes data from Ctrip for the given destination.
+    Extracts the hotel listings from a Ctrip search result page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    hotels = []
+    for item in soup.select(".hotel"):
+        hotels.append({
+            "name": item.select_one(".name").get_text(strip=True),
+            "price": float(item.select_one(".price").get_text(strip=True)),
+        })
+    return {"hotels": hotels}
+
+
+async def _stream(destination, start_date=None, end_date=None):
+    """
+    Streams Ctrip listings for the given destination as ("hotel", record)
+    pairs, one result page at a time.
     """
     print(f"Scraping Ctrip for {destination}...")
-    # In a real implementation, you would use libraries like requests, BeautifulSoup, or Selenium to scrape the data.
-    # For this example, we'll return some dummy data.
-    await asyncio.sleep(2)  # Simulate network latency
-    return {"hotels": [{"name": "Hotel A", "price": 100}, {"name": "Hotel B", "price": 150}]}
+    base_url = SCRAPER_BASE_URLS.get(SOURCE)
+    if not base_url:
+        # No site configured, so we return some dummy data.
+        await asyncio.sleep(2)  # Simulate network latency
+        for hotel in [{"name": "Hotel A", "price": 100}, {"name": "Hotel B", "price": 150}]:
+            yield "hotel", hotel
+        return
+
+    params = {"city": destination}
+    if start_date:
+        params["checkin"] = start_date
+    if end_date:
+        params["checkout"] = end_date
+    for page in range(1, SCRAPER_MAX_PAGES + 1):
+        hotels = (await conditional.fetch_listing(
+            f"{base_url}/hotels", parse, params={**params, "page": page}, source=SOURCE,
+        ))["hotels"]
+        if not hotels:
+            break
+        for hotel in hotels:
+            yield "hotel", hotel
+
+
+# Streaming entry point (orchestrator.stream_all), read and filled through the scrape cache.
+stream = cache.cached_stream(SOURCE, "hotel")(_stream)
+
+
+@cache.cached(SOURCE)
+async def scrape(destination, start_date=None, end_date=None):
+    """
+    Scrapes data from Ctrip for the given destination.
+    """
+    return {"hotels": [hotel async for _, hotel in _stream(destination, start_date, end_date)]}
@@ -1,11 +1,59 @@
 import asyncio
 
-async def scrape(destination):
+from bs4 import BeautifulSoup
+
+from config import SCRAPER_BASE_URLS, SCRAPER_MAX_PAGES
+from . import cache, conditional
+
+SOURCE = "dianping"
+
+
+def parse(html):
     """
-    Scrapes data from Dianping for the given destination.
+    Extracts the restaurant listings from a Dianping search result page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    restaurants = []
+    for item in soup.select(".restaurant"):
+        restaurants.append({
+            "name": item.select_one(".name").get_text(strip=True),
+            "rating": float(item.select_one(".rating").get_text(strip=True)),
+        })
+    return {"restaurants": restaurants}
+
+
+async def _stream(destination, start_date=None, end_date=None):
+    """
+    Streams Dianping listings for the given destination as
+    ("restaurant", record) pairs, one result page at a time.
     """
     print(f"Scraping Dianping for {destination}...")
-    # In a real implementation, you would use libraries like requests, BeautifulSoup, or Selenium to scrape the data.
-    # For this example, we'll return some dummy data.
-    await asyncio.sleep(2)  # Simulate network latency
-    return {"restaurants": [{"name": "Restaurant A", "rating": 4.5}, {"name": "Restaurant B", "rating": 4.0}]}
+    base_url = SCRAPER_BASE_URLS.get(SOURCE)
+    if not base_url:
+        # No site configured, so we return some dummy data.
+        await asyncio.sleep(2)  # Simulate network latency
+        for restaurant in [{"name": "Restaurant A", "rating": 4.5}, {"name": "Restaurant B", "rating": 4.0}]:
+            yield "restaurant", restaurant
+        return
+
+    params = {"city": destination}
+    for page in range(1, SCRAPER_MAX_PAGES + 1):
+        restaurants = (await conditional.fetch_listing(
+            f"{base_url}/restaurants", parse, params={**params, "page": page}, source=SOURCE,
+        ))["restaurants"]
+        if not restaurants:
+            break
+        for restaurant in restaurants:
+            yield "restaurant", restaurant
+
+
+# Streaming entry point (orchestrator.stream_all), read and filled through the scrape cache.
+stream = cache.cached_stream(SOURCE, "restaurant")(_stream)
+
+
+@cache.cached(SOURCE)
+async def scrape(destination, start_date=None, end_date=None):
+    """
+    Scrapes data from Dianping for the given destination.
+    """
+    return {"restaurants": [restaurant async for _, restaurant in _stream(destination, start_date, end_date)]}
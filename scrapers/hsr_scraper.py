@@ -1,11 +1,64 @@
 import asyncio
 
-async def scrape(destination):
+from bs4 import BeautifulSoup
+
+from config import SCRAPER_BASE_URLS, SCRAPER_MAX_PAGES
+from . import cache, conditional
+
+SOURCE = "hsr"
+
+
+def parse(html):
     """
-    Scrapes data from HSR for the given destination.
+    Extracts the train timetable rows from an HSR search result page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    trains = []
+    for item in soup.select(".train"):
+        trains.append({
+            "number": item.select_one(".number").get_text(strip=True),
+            "departure": item.select_one(".departure").get_text(strip=True),
+            "arrival": item.select_one(".arrival").get_text(strip=True),
+        })
+    return {"trains": trains}
+
+
+async def _stream(destination, start_date=None, end_date=None):
+    """
+    Streams HSR timetable rows for the given destination as ("train", record)
+    pairs, one result page at a time.
     """
     print(f"Scraping HSR for {destination}...")
-    # In a real implementation, you would use libraries like requests, BeautifulSoup, or Selenium to scrape the data.
-    # For this example, we'll return some dummy data.
-    await asyncio.sleep(2)  # Simulate network latency
-    return {"trains": [{"number": "G123", "departure": "08:00", "arrival": "10:30"}]}
+    base_url = SCRAPER_BASE_URLS.get(SOURCE)
+    if not base_url:
+        # No site configured, so we return some dummy data.
+        await asyncio.sleep(2)  # Simulate network latency
+        for train in [{"number": "G123", "departure": "08:00", "arrival": "10:30"}]:
+            yield "train", train
+        return
+
+    # Pages are fetched through the shared pooled client with conditional
+    # requests; unchanged pages reuse the rows extracted last time.
+    params = {"to": destination}
+    if start_date:
+        params["date"] = start_date
+    for page in range(1, SCRAPER_MAX_PAGES + 1):
+        trains = (await conditional.fetch_parsed(
+            f"{base_url}/trains", parse, params={**params, "page": page}, source=SOURCE,
+        ))["trains"]
+        if not trains:
+            break
+        for train in trains:
+            yield "train", train
+
+
+# Streaming entry point (orchestrator.stream_all), read and filled through the scrape cache.
+stream = cache.cached_stream(SOURCE, "train")(_stream)
+
+
+@cache.cached(SOURCE)
+async def scrape(destination, start_date=None, end_date=None):
+    """
+    Scrapes data from HSR for the given destination.
+    """
+    return {"trains": [train async for _, train in _stream(destination, start_date, end_date)]}
@@ -0,0 +1,124 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP2_ENABLED,
+    HTTP_USER_AGENT,
+    HTTP_MAX_RETRIES,
+    HTTP_THROTTLE_STATUSES,
+    CAPTCHA_MARKERS,
+)
+from . import rate_limiter
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 support in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+_client = None
+_host_slots = {}
+
+
+class ThrottledError(Exception):
+    """
+    Raised when a site keeps throttling a source after every retry.
+    """
+
+
+def get_client():
+    """
+    Returns the process-wide async HTTP client, creating it on first use.
+    Connections are kept alive and reused across all scrapers; HTTP/2 is
+    negotiated via ALPN for sites that support it.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            headers={"User-Agent": HTTP_USER_AGENT},
+            follow_redirects=True,
+        )
+    return _client
+
+
+def _host_slot(url):
+    """
+    Returns the semaphore capping concurrent requests to the url's host.
+    """
+    host = urlsplit(url).netloc
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+    return slot
+
+
+def is_throttled(resp):
+    """
+    Returns True if a response is a throttling signal: a 429/403 status or
+    a captcha challenge page served in place of the content.
+    """
+    if resp.status_code in HTTP_THROTTLE_STATUSES:
+        return True
+    if "html" not in resp.headers.get("content-type", ""):
+        return False
+    head = resp.text[:4096].lower()
+    return any(marker in head for marker in CAPTCHA_MARKERS)
+
+
+async def request(method, url, source=None, **kwargs):
+    """
+    Sends a request through the shared client, respecting the per-host limit.
+    Extra keyword arguments (params, headers, timeout, ...) go to httpx.
+
+    When `source` is given the request also goes through that source's
+    shared rate limiter; throttling responses slow the whole source down
+    and are retried with jittered exponential backoff.
+    """
+    if source is None:
+        async with _host_slot(url):
+            return await get_client().request(method, url, **kwargs)
+
+    limiter = rate_limiter.get_limiter(source)
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        await limiter.acquire()
+        async with _host_slot(url):
+            resp = await get_client().request(method, url, **kwargs)
+        if not is_throttled(resp):
+            limiter.on_success()
+            return resp
+        delay = limiter.on_throttle()
+        print(f"{source} throttled ({resp.status_code}), backing off {delay:.1f}s")
+    raise ThrottledError(f"{source} still throttled after {HTTP_MAX_RETRIES} retries: {url}")
+
+
+async def get(url, **kwargs):
+    """
+    Convenience wrapper for GET requests.
+    """
+    return await request("GET", url, **kwargs)
+
+
+async def close():
+    """
+    Closes the shared client and drops its pooled connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_slots.clear()
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from config import SCRAPER_TIMEOUTS, SCRAPER_DEFAULT_TIMEOUT, SCRAPER_STREAM_BUFFER
+from . import ctrip_scraper, hsr_scraper, dianping_scraper
+
+# Registered sources, in the order they appear in the combined data.
+SOURCES = {
+    "ctrip": ctrip_scraper,
+    "hsr": hsr_scraper,
+    "dianping": dianping_scraper,
+}
+
+
+def register(name, module):
+    """
+    Registers a scraper module under the given source name.
+    The module must expose an async `scrape(destination, start_date, end_date)`
+    function and an async generator `stream(destination, start_date, end_date)`
+    yielding (kind, record) pairs.
+    """
+    SOURCES[name] = module
+
+
+async def _run_source(name, module, destination, start_date, end_date, timeout):
+    """
+    Runs a single scraper under its deadline and reports how it went.
+    """
+    started = time.perf_counter()
+    try:
+        data = await asyncio.wait_for(module.scrape(destination, start_date, end_date), timeout)
+        return name, data, None, time.perf_counter() - started
+    except asyncio.TimeoutError:
+        return name, None, f"timeout after {timeout:g}s", time.perf_counter() - started
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+
+async def scrape_all(destination, start_date=None, end_date=None, sources=None, timeouts=None):
+    """
+    Scrapes all registered sources concurrently, each under its own deadline.
+
+    Returns a dict keyed by source name holding whatever arrived in time.
+    Sources that timed out or failed are set to None and listed under
+    "missing" with the reason, so the planner can work with partial data.
+    """
+    sources = SOURCES if sources is None else {name: SOURCES[name] for name in sources}
+    timeouts = {**SCRAPER_TIMEOUTS, **(timeouts or {})}
+
+    results = await asyncio.gather(*(
+        _run_source(name, module, destination, start_date, end_date, timeouts.get(name, SCRAPER_DEFAULT_TIMEOUT))
+        for name, module in sources.items()
+    ))
+
+    all_data = {name: data for name, data, _, _ in results}
+    all_data["missing"] = {}
+    all_data["elapsed"] = {}
+    for name, _, error, elapsed in results:
+        all_data["elapsed"][name] = round(elapsed, 3)
+        if error is not None:
+            print(f"Source {name} missing: {error}")
+            all_data["missing"][name] = error
+    return all_data
+
+
+async def _pump(name, module, destination, start_date, end_date, timeout, queue):
+    """
+    Copies one source's stream into the shared queue under its deadline,
+    then puts a None sentinel to mark the source as finished.
+    """
+    async def run():
+        async for kind, record in module.stream(destination, start_date, end_date):
+            await queue.put((name, kind, record))
+
+    try:
+        await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        await queue.put((name, "missing", f"timeout after {timeout:g}s"))
+    except Exception as e:
+        await queue.put((name, "missing", f"{type(e).__name__}: {e}"))
+    finally:
+        await queue.put(None)
+
+
+async def stream_all(destination, start_date=None, end_date=None, sources=None, timeouts=None):
+    """
+    Streams records from all registered sources concurrently as
+    (source, kind, record) tuples, in arrival order.
+
+    Each source runs under its own deadline. A source that times out or
+    fails yields a final (source, "missing", reason) tuple; records it
+    produced before that are kept. The queue between scrapers and consumer
+    is bounded, so a slow consumer holds scrapers back instead of letting
+    records pile up in memory.
+    """
+    sources = SOURCES if sources is None else {name: SOURCES[name] for name in sources}
+    timeouts = {**SCRAPER_TIMEOUTS, **(timeouts or {})}
+    queue = asyncio.Queue(maxsize=SCRAPER_STREAM_BUFFER)
+
+    pumps = [
+        asyncio.create_task(_pump(
+            name, module, destination, start_date, end_date,
+            timeouts.get(name, SCRAPER_DEFAULT_TIMEOUT), queue,
+        ))
+        for name, module in sources.items()
+    ]
+    remaining = len(pumps)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is None:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        for pump in pumps:
+            pump.cancel()
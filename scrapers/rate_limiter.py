@@ -0,0 +1,118 @@
+import asyncio
+import random
+import time
+
+from config import (
+    SCRAPER_RATE_LIMITS,
+    SCRAPER_DEFAULT_RATE,
+    SCRAPER_MIN_RATE,
+    SCRAPER_MAX_RATE,
+    SCRAPER_RATE_INCREASE,
+    SCRAPER_RATE_DECREASE,
+    SCRAPER_BACKOFF_BASE,
+    SCRAPER_BACKOFF_MAX,
+)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every request to one source.
+
+    The rate creeps up by `increase` after each success and is cut by
+    `decrease` on a throttling signal (429/403/captcha), which also pauses
+    the whole source for a jittered exponential backoff. Over time the rate
+    settles just under what the site tolerates.
+    """
+
+    def __init__(self, source, rate, min_rate=SCRAPER_MIN_RATE, max_rate=SCRAPER_MAX_RATE,
+                 increase=SCRAPER_RATE_INCREASE, decrease=SCRAPER_RATE_DECREASE):
+        self.source = source
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = 1.0
+        self.waiting = 0
+        self.throttled = 0
+        self._strikes = 0
+        self._paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        # Burst is capped at one second's worth of requests.
+        self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Waits until the source may be sent another request.
+        """
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._paused_until:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    self._refill(now)
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        return
+                    await asyncio.sleep((1.0 - self.tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+    def on_success(self):
+        """
+        Records a successful request and nudges the rate up.
+        """
+        self._strikes = 0
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        """
+        Records a throttling signal: cuts the rate and pauses the source.
+        Returns the backoff delay in seconds.
+        """
+        self.throttled += 1
+        self._strikes += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = 0.0
+        ceiling = min(SCRAPER_BACKOFF_MAX, SCRAPER_BACKOFF_BASE * 2 ** (self._strikes - 1))
+        delay = random.uniform(ceiling / 2, ceiling)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def stats(self):
+        return {
+            "source": self.source,
+            "rate": round(self.rate, 3),
+            "queue_depth": self.waiting,
+            "throttled": self.throttled,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+        }
+
+
+_limiters = {}
+
+
+def get_limiter(source):
+    """
+    Returns the process-wide limiter for a source, creating it on first use.
+    """
+    limiter = _limiters.get(source)
+    if limiter is None:
+        limiter = _limiters[source] = AdaptiveRateLimiter(
+            source, SCRAPER_RATE_LIMITS.get(source, SCRAPER_DEFAULT_RATE)
+        )
+    return limiter
+
+
+def stats():
+    """
+    Returns the current rate and queue depth of every source's limiter.
+    """
+    return {source: limiter.stats() for source, limiter in _limiters.items()}
@@ -0,0 +1,128 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class Hotel:
+    name: str
+    price: float
+    source: str = ""
+
+
+@dataclass(slots=True)
+class Restaurant:
+    name: str
+    rating: float
+    source: str = ""
+
+
+@dataclass(slots=True)
+class Train:
+    number: str
+    departure: str
+    arrival: str
+    source: str = ""
+
+
+# Record type per listing key in scraper output.
+RECORD_TYPES = {
+    "hotels": Hotel,
+    "restaurants": Restaurant,
+    "trains": Train,
+}
+
+# Column dtypes of the table per listing key; times become minutes past midnight.
+COLUMNS = {
+    "hotels": {"name": "string", "price": "float64", "source": "category"},
+    "restaurants": {"name": "string", "rating": "float64", "source": "category"},
+    "trains": {
+        "number": "string", "departure": "string", "arrival": "string",
+        "departure_min": "int16", "arrival_min": "int16", "source": "category",
+    },
+}
+
+
+def from_dicts(key, dicts, source=""):
+    """
+    Converts one list of scraped dicts into slotted records, ignoring
+    fields the record type doesn't know.
+    """
+    cls = RECORD_TYPES[key]
+    names = [field.name for field in fields(cls) if field.name != "source"]
+    return [cls(*(item.get(name) for name in names), source=source) for item in dicts]
+
+
+def to_records(all_data):
+    """
+    Converts combined scraper output ({source: {key: [dict, ...]}}) into
+    {key: [record, ...]}.
+    """
+    records = {key: [] for key in RECORD_TYPES}
+    for source, data in all_data.items():
+        if not isinstance(data, dict) or source == "missing":
+            continue
+        for key, items in data.items():
+            if key in RECORD_TYPES:
+                records[key].extend(from_dicts(key, items, source))
+    return records
+
+
+def _minutes(column):
+    parts = column.str.extract(r"^(\d{1,2}):(\d{2})")
+    minutes = parts[0].astype("float32") * 60 + parts[1].astype("float32")
+    return minutes.fillna(-1).astype("int16")
+
+
+def to_tables(all_data):
+    """
+    Converts combined scraper output into one typed DataFrame per listing
+    key, so filtering and sorting run vectorised over columns.
+    """
+    tables = {}
+    for key, dtypes in COLUMNS.items():
+        frames = []
+        for source, data in all_data.items():
+            if not isinstance(data, dict) or source == "missing" or not data.get(key):
+                continue
+            frame = pd.DataFrame.from_records(data[key])
+            frame["source"] = source
+            frames.append(frame)
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[c for c in dtypes if not c.endswith("_min")])
+        if key == "trains":
+            table["departure_min"] = _minutes(table["departure"].astype("string"))
+            table["arrival_min"] = _minutes(table["arrival"].astype("string"))
+        tables[key] = table[list(dtypes)].astype(dtypes)
+    return tables
+
+
+def filter_sort(table, column, low=None, high=None, ascending=True, limit=None):
+    """
+    Returns the rows of `table` whose `column` lies in [low, high], sorted
+    by that column.
+    """
+    mask = np.ones(len(table), dtype=bool)
+    values = table[column].to_numpy()
+    if low is not None:
+        mask &= values >= low
+    if high is not None:
+        mask &= values <= high
+    result = table[mask].sort_values(column, ascending=ascending, kind="stable")
+    return result if limit is None else result.head(limit)
+
+
+def cheapest_hotels(tables, max_price=None, limit=None):
+    return filter_sort(tables["hotels"], "price", high=max_price, limit=limit)
+
+
+def top_restaurants(tables, min_rating=None, limit=None):
+    return filter_sort(tables["restaurants"], "rating", low=min_rating, ascending=False, limit=limit)
+
+
+def trains_departing(tables, after=None, before=None, limit=None):
+    """
+    Trains departing between two "HH:MM" times, earliest first.
+    """
+    to_min = lambda hhmm: None if hhmm is None else int(hhmm[:2]) * 60 + int(hhmm[3:5])
+    return filter_sort(tables["trains"], "departure_min", low=to_min(after), high=to_min(before), limit=limit)
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from urllib.parse import urlsplit, parse_qs
+
+from config import SERVER_HOST, SERVER_PORT
+from main import collect, shutdown
+from planners import llm, trip_planner
+
+
+def sse_event(data, event=None):
+    """
+    Encodes one Server-Sent Event; multi-line data is split across data: lines.
+    """
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in data.split("\n")]
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def _respond(writer, status, body, content_type="text/plain; charset=utf-8"):
+    payload = body.encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("utf-8") + payload
+    )
+    await writer.drain()
+
+
+async def stream_plan(writer, query):
+    """
+    Relays a plan to the client day by day as SSE "day" events, followed by
+    a "done" event ("error" first if collecting or the model fails). Query
+    parameters: destination, start_date, end_date and interests
+    (comma-separated).
+    """
+    destination = query.get("destination", [""])[0]
+    start_date = query.get("start_date", [""])[0]
+    end_date = query.get("end_date", [""])[0]
+    interests = query.get("interests", [""])[0].split(",")
+    if not destination:
+        await _respond(writer, "400 Bad Request", "destination is required")
+        return
+
+    writer.write(
+        b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+        b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n"
+    )
+    writer.write(sse_event("collecting", event="status"))
+    await writer.drain()
+
+    try:
+        all_data = await collect(destination, start_date, end_date, interests)
+    except Exception as e:
+        # The headers are already sent; report the failure as an event.
+        print(f"Collecting data for {destination} failed: {type(e).__name__}: {e}")
+        writer.write(sse_event(f"collecting failed: {type(e).__name__}: {e}", event="error"))
+        writer.write(sse_event("", event="done"))
+        await writer.drain()
+        return
+    if all_data["missing"]:
+        writer.write(sse_event(json.dumps(all_data["missing"], ensure_ascii=False), event="missing"))
+    try:
+        async for chunk in trip_planner.plan_stream(all_data, destination, start_date, end_date, interests):
+            writer.write(sse_event(chunk, event="day"))
+            await writer.drain()
+    except llm.LLMError as e:
+        writer.write(sse_event(str(e), event="error"))
+    writer.write(sse_event("", event="done"))
+    await writer.drain()
+
+
+async def handle(reader, writer):
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # Headers are not needed
+        if len(request_line) < 2 or request_line[0] != "GET":
+            await _respond(writer, "405 Method Not Allowed", "only GET is supported")
+            return
+        url = urlsplit(request_line[1])
+        if url.path == "/plan/stream":
+            await stream_plan(writer, parse_qs(url.query))
+        else:
+            await _respond(writer, "404 Not Found", "not found")
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass  # Client went away
+    finally:
+        writer.close()
+
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT):
+    """
+    Serves GET /plan/stream so the H5 page can show the plan as it is written:
+
+        const source = new EventSource(`/plan/stream?destination=哈尔滨&start_date=...`);
+        source.addEventListener("day", (e) => render(e.data));
+    """
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Serving plans on http://{host}:{port}/plan/stream")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,141 @@
+import asyncio
+
+from config import SINGLE_FLIGHT_REPLAY_LIMIT
+
+
+class _Broadcast:
+    """
+    Runs one async iterator and replays its items to any number of subscribers.
+
+    Subscribers that join later receive the items produced so far, up to
+    `replay_limit` of them. Once the iterator has produced more than that,
+    items every subscriber has consumed are dropped and the broadcast stops
+    accepting new subscribers.
+    """
+
+    def __init__(self, source, replay_limit=SINGLE_FLIGHT_REPLAY_LIMIT):
+        self.source = source
+        self.replay_limit = replay_limit
+        self.items = []
+        self.start = 0
+        self.cursors = {}
+        self.done = False
+        self.error = None
+        self.changed = asyncio.Condition()
+
+    @property
+    def joinable(self):
+        return self.start == 0
+
+    def _trim(self):
+        end = self.start + len(self.items)
+        if end <= self.replay_limit:
+            return
+        low = min(self.cursors.values(), default=end)
+        del self.items[:low - self.start]
+        self.start = low
+
+    async def run(self):
+        try:
+            async for item in self.source:
+                async with self.changed:
+                    self.items.append(item)
+                    self._trim()
+                    self.changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self.changed:
+                self.done = True
+                self.changed.notify_all()
+
+    def join(self):
+        """
+        Registers a subscriber at the oldest retained item and returns the
+        token to pass to `subscribe`.
+        """
+        token = object()
+        self.cursors[token] = self.start
+        return token
+
+    async def subscribe(self, token):
+        try:
+            while True:
+                async with self.changed:
+                    await self.changed.wait_for(
+                        lambda: self.cursors[token] < self.start + len(self.items) or self.done
+                    )
+                    items, done = self.items[self.cursors[token] - self.start:], self.done
+                for item in items:
+                    yield item
+                self.cursors[token] += len(items)
+                self._trim()
+                if done and self.cursors[token] >= self.start + len(self.items):
+                    if self.error is not None:
+                        raise self.error
+                    return
+        finally:
+            del self.cursors[token]
+            self._trim()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller starts the
+    work and everyone who asks for the same key while it is in flight waits
+    for that result instead of starting their own.
+
+    The shared work is shielded, so a caller that gives up (e.g. on its own
+    deadline) does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._streams = {}
+        self.executed = 0
+        self.shared = 0
+
+    def _forget(self, table, key, entry):
+        if table.get(key) is entry:
+            del table[key]
+
+    async def do(self, key, fn, *args, **kwargs):
+        """
+        Returns the result of `await fn(*args, **kwargs)`, shared with any
+        concurrent call for the same key.
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._forget(self._calls, key, future))
+            self.executed += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+    async def stream(self, key, make_stream):
+        """
+        Yields the items of the async iterator returned by `make_stream()`,
+        shared with any concurrent call for the same key. Callers that join
+        late first receive the items produced so far; once the shared run has
+        dropped consumed items, a late caller starts a fresh run instead.
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is None or not broadcast.joinable:
+            broadcast = _Broadcast(make_stream())
+            self._streams[key] = broadcast
+            task = asyncio.ensure_future(broadcast.run())
+            task.add_done_callback(lambda _: self._forget(self._streams, key, broadcast))
+            self.executed += 1
+        else:
+            self.shared += 1
+        async for item in broadcast.subscribe(broadcast.join()):
+            yield item
+
+    def stats(self):
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "executed": self.executed,
+            "shared": self.shared,
+        }
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules are imported from the repository root, as the scripts run them,
+# and the tools/bus scripts import each other from their own directory.
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, "tools", "bus"))
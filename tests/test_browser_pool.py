@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from scrapers import browser_pool, rate_limiter
+from scrapers.http_client import ThrottledError
+
+
+class FakePool:
+    def __init__(self, pages):
+        self.pages = list(pages)
+
+    @asynccontextmanager
+    async def page(self):
+        status, html = self.pages.pop(0)
+
+        async def goto(url, wait_until=None):
+            return SimpleNamespace(status=status)
+
+        async def content():
+            return html
+
+        yield SimpleNamespace(goto=goto, content=content)
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = rate_limiter.AdaptiveRateLimiter("test", rate=100.0, max_rate=1000.0)
+    monkeypatch.setattr(rate_limiter, "get_limiter", lambda source: limiter)
+    monkeypatch.setattr(rate_limiter, "SCRAPER_BACKOFF_BASE", 0.01)
+    return limiter
+
+
+def test_fetch_html_backs_off_on_throttling_and_captcha(monkeypatch, limiter):
+    pool = FakePool([(429, ""), (200, "<html>请完成安全验证</html>"), (200, "<html>ok</html>")])
+    monkeypatch.setattr(browser_pool, "get_pool", lambda: pool)
+
+    assert asyncio.run(browser_pool.fetch_html("http://example.test", source="test")) == "<html>ok</html>"
+    assert limiter.throttled == 2
+    assert limiter.rate < 100.0
+
+
+def test_fetch_html_gives_up_after_retries(monkeypatch, limiter):
+    monkeypatch.setattr(browser_pool, "HTTP_MAX_RETRIES", 1)
+    monkeypatch.setattr(browser_pool, "get_pool", lambda: FakePool([(403, ""), (403, "")]))
+
+    with pytest.raises(ThrottledError):
+        asyncio.run(browser_pool.fetch_html("http://example.test", source="test"))
+
+
+def test_fetch_html_reports_success(monkeypatch, limiter):
+    monkeypatch.setattr(browser_pool, "get_pool", lambda: FakePool([(200, "<html>ok</html>")]))
+
+    asyncio.run(browser_pool.fetch_html("http://example.test", {"page": 1}, source="test"))
+    assert limiter.rate > 100.0 and limiter.throttled == 0
+
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = []
+        self.closed = False
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def crash(self):
+        for handler in self.handlers:
+            handler(self)
+
+    async def new_page(self):
+        async def close():
+            pass
+        return SimpleNamespace(close=close)
+
+    async def close(self):
+        self.closed = True
+
+
+def _pool(monkeypatch, contexts):
+    pool = browser_pool.BrowserPool(size=1)
+    async def close():
+        pass
+
+    pool._browser = SimpleNamespace(is_connected=lambda: True, close=close)
+
+    async def new_context():
+        contexts.append(FakeContext())
+        return contexts[-1]
+
+    monkeypatch.setattr(pool, "_new_context", new_context)
+    return pool
+
+
+def test_navigation_errors_keep_the_context(monkeypatch):
+    contexts = []
+    pool = _pool(monkeypatch, contexts)
+
+    async def run():
+        for error in (browser_pool.PlaywrightError("net::ERR_NAME_NOT_RESOLVED"),
+                      browser_pool.PlaywrightError("Timeout 30000ms exceeded")):
+            with pytest.raises(browser_pool.PlaywrightError):
+                async with pool.page():
+                    raise error
+        async with pool.page():
+            pass
+
+    asyncio.run(run())
+    assert len(contexts) == 1 and not contexts[0].closed
+
+
+def test_closed_context_is_rebuilt(monkeypatch):
+    contexts = []
+    pool = _pool(monkeypatch, contexts)
+
+    async def run():
+        with pytest.raises(browser_pool.PlaywrightError):
+            async with pool.page():
+                contexts[0].crash()
+                raise browser_pool.PlaywrightError("Target page, context or browser has been closed")
+        async with pool.page():
+            pass
+
+    asyncio.run(run())
+    assert len(contexts) == 2 and contexts[0].closed
+
+
+def test_page_released_after_close_is_discarded(monkeypatch):
+    contexts = []
+    pool = _pool(monkeypatch, contexts)
+
+    async def run():
+        async with pool.page():
+            await pool.close()
+
+    asyncio.run(run())
+    assert contexts[0].closed and pool._slots is None
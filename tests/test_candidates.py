@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+from planners.candidates import CandidatePool, _build_candidate, generate
+from planners.scheduler import DaySpec, POI
+
+DAYS = [DaySpec("8/17", "哈尔滨"), DaySpec("8/18", "哈尔滨")]
+POIS = [POI(name, "哈尔滨", 90, priority=1) for name in ("中央大街", "索菲亚教堂", "太阳岛", "防洪纪念塔")]
+
+
+def _features(price):
+    hotel = {"name": "酒店", "price": price}
+    _, _, features = _build_candidate((0, DAYS, POIS, ["老厨家"], hotel, "standard"))
+    return features
+
+
+def test_missing_hotel_price_is_unknown_not_free():
+    assert math.isnan(_features(None)["cost"])
+    assert _features(300)["cost"] == 600.0
+
+
+def test_missing_price_scores_worst_on_price():
+    results = [([], {"seed": i}, {**_features(price), "rest": 0, "moving": 0, "longest_day": 600})
+               for i, price in enumerate((None, 300, 500))]
+    scores = dict(CandidatePool(results).rank({"price": 1}, limit=3))
+    assert scores[1] == 1.0
+    assert scores[0] == min(scores.values()) == 0.0
+
+
+def test_generate_rejects_empty_count():
+    with pytest.raises(ValueError):
+        generate(DAYS, POIS, count=0)
+
+
+def test_generate_is_deterministic():
+    hotels = [{"name": "A", "price": 200}, {"name": "B", "price": None}]
+    first = generate(DAYS, POIS, ["老厨家"], hotels, count=4, max_workers=2)
+    second = generate(DAYS, POIS, ["老厨家"], hotels, count=4, max_workers=2)
+    assert len(first) == 4
+    assert first.plans == second.plans
+    assert first.rank({"price": 1}) == second.rank({"price": 1})
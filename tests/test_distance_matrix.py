@@ -0,0 +1,57 @@
+import numpy as np
+
+from planners.distance_matrix import DistanceMatrix, haversine_matrix
+from planners.scheduler import DEFAULT_TRAVEL_MIN, DaySpec, POI, haversine_travel, schedule
+
+POIS = [
+    POI("中央大街", "哈尔滨", 60, lat=45.7731, lng=126.6172),
+    POI("索菲亚教堂", "哈尔滨", 60, lat=45.7698, lng=126.6251),
+    POI("防洪纪念塔", "哈尔滨", 60, lat=45.7766, lng=126.6195),
+    POI("太阳岛", "哈尔滨", 120, lat=45.7910, lng=126.5836),
+    POI("无坐标", "哈尔滨", 60),
+]
+
+
+def test_haversine_matrix_is_symmetric_with_zero_diagonal():
+    km = haversine_matrix([45.77, 45.79, 39.9], [126.62, 126.58, 116.4])
+    assert np.allclose(km, km.T)
+    assert np.allclose(np.diag(km), 0.0)
+    assert 1000 < km[0, 2] < 1100
+
+
+def test_travel_time_falls_back_for_pois_without_coordinates():
+    lookup = DistanceMatrix(POIS).travel_time()
+    assert lookup(POIS[0], POIS[4]) == DEFAULT_TRAVEL_MIN
+    assert lookup(POIS[4], POIS[1]) == DEFAULT_TRAVEL_MIN
+    assert lookup(None, POIS[0]) == haversine_travel(None, POIS[0])
+    assert lookup(POIS[0], POIS[1]) > 0
+
+
+def test_schedule_with_matrix_and_missing_coordinates():
+    plans = schedule([DaySpec("8/17", "哈尔滨")], POIS, travel_time=DistanceMatrix(POIS).travel_time())
+    assert {slot.activity for slot in plans[0].slots if slot.kind == "sight"} >= {"无坐标", "中央大街"}
+
+
+def test_nearest_skips_pois_without_coordinates():
+    nearest = DistanceMatrix(POIS).nearest(2)
+    assert nearest.shape == (5, 2)
+    assert (nearest[4] == -1).all()
+    for i, row in enumerate(nearest[:4]):
+        assert i not in row and 4 not in row
+    assert list(nearest[0]) == [2, 1]
+
+
+def test_refine_only_routes_located_pairs_once():
+    matrix = DistanceMatrix(POIS)
+    calls = []
+
+    def route(a, b, mode):
+        calls.append((a.name, b.name))
+        return 7
+
+    routed = matrix.refine(route, k=1)
+    assert routed == len(calls) and calls
+    assert all("无坐标" not in pair for pair in calls)
+    assert matrix.refine(route, k=1) == 0
+    i, j = matrix.index["中央大街"], matrix.index["防洪纪念塔"]
+    assert matrix.travel_time()(POIS[i], POIS[j]) == 7
@@ -0,0 +1,36 @@
+from planners.history import HistoryStore
+
+
+def test_torn_last_line_is_cut_and_appends_continue(tmp_path):
+    store = HistoryStore("trip", root=str(tmp_path), snapshot_every=2)
+    store.append("first", [0], state={"n": 1})
+    store.append("second", [1], state={"n": 2})
+    with open(store.revisions_path, "ab") as f:
+        f.write(b'{"revision": 2, "da')
+
+    reopened = HistoryStore("trip", root=str(tmp_path), snapshot_every=2)
+    assert len(reopened) == 2
+    assert reopened.append("third", [0]) == 2
+    assert reopened.get(2)["summary"] == "third"
+    assert [record["revision"] for record in HistoryStore("trip", root=str(tmp_path)).recent()] == [2, 1, 0]
+
+
+def test_state_at_replays_revisions_after_the_nearest_snapshot(tmp_path):
+    store = HistoryStore("trip", root=str(tmp_path), snapshot_every=2)
+    for n in range(5):
+        store.append(f"change {n}", [n % 2], state={"n": n})
+
+    state, later = store.state_at(4)
+    assert state == {"n": 3}
+    assert [record["summary"] for record in later] == ["change 4"]
+    state, later = store.state_at(0)
+    assert state is None and [record["revision"] for record in later] == [0]
+
+
+def test_recent_filters_by_day(tmp_path):
+    store = HistoryStore("trip", root=str(tmp_path))
+    store.append("a", [0])
+    store.append("b", [1])
+    store.append("c", [0, 1])
+    assert [record["summary"] for record in store.recent(days=[0])] == ["c", "a"]
+    assert store.prompt_context(days=[1]) == "- 修订 2: b\n- 修订 3: c"
@@ -0,0 +1,47 @@
+import asyncio
+
+from planners.plan_cache import PlanCache
+
+TRIP = ("哈尔滨", "2025-08-17", "2025-08-20")
+
+
+def _embedder(calls, fail=False):
+    async def embed(text):
+        calls.append(text)
+        if fail:
+            raise RuntimeError("embeddings unavailable")
+        return [1.0, 0.0, 0.0]
+    return embed
+
+
+def test_miss_embeds_once_and_similar_interests_hit():
+    async def run():
+        calls = []
+        cache = PlanCache(embed=_embedder(calls))
+        assert await cache.get(*TRIP, ["food"]) is None
+        await cache.put(*TRIP, ["food"], "plan")
+        assert len(calls) == 1
+        assert await cache.get(*TRIP, ["local food"]) == "plan"
+        assert cache.semantic_hits == 1
+        assert await cache.get("齐齐哈尔", *TRIP[1:], ["food"]) is None
+    asyncio.run(run())
+
+
+def test_data_key_separates_entries():
+    async def run():
+        cache = PlanCache()
+        await cache.put(*TRIP, ["food"], "old", data_key="a")
+        assert await cache.get(*TRIP, ["food"], data_key="a") == "old"
+        assert await cache.get(*TRIP, ["food"], data_key="b") is None
+    asyncio.run(run())
+
+
+def test_embedding_errors_fall_back_to_exact_lookup():
+    async def run():
+        calls = []
+        cache = PlanCache(embed=_embedder(calls, fail=True))
+        await cache.put(*TRIP, ["food"], "plan")
+        assert await cache.get(*TRIP, [" Food"]) == "plan"
+        assert await cache.get(*TRIP, ["museums"]) is None
+        assert calls
+    asyncio.run(run())
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+import polyline
+
+
+def test_decode_returns_lng_lat_rows():
+    points = polyline.decode("126.6,45.7;126.7,45.8;")
+    assert points.shape == (2, 2)
+    assert points[:, polyline.LNG].tolist() == [126.6, 126.7]
+    assert polyline.latlng(points)[0].tolist() == [45.7, 126.6]
+    assert polyline.decode("").shape == (0, 2)
+
+
+def test_decode_rejects_malformed_input():
+    with pytest.raises(ValueError):
+        polyline.decode("126.6,45.7;126.7")
+    with pytest.raises(ValueError):
+        polyline.decode("126.6,abc")
+
+
+def test_decode_many_splits_per_polyline():
+    parts = polyline.decode_many(["1,2;3,4", "", None, "5,6"])
+    assert [part.shape[0] for part in parts] == [2, 0, 0, 1]
+    assert np.array_equal(np.concatenate(parts), polyline.concat(["1,2;3,4", "5,6"]))
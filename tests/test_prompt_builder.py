@@ -0,0 +1,20 @@
+from planners.prompt_builder import _format_value, build_prompt
+
+
+def test_format_value_blanks_missing_values():
+    assert _format_value(None) == ""
+    assert _format_value(float("nan")) == ""
+    assert _format_value(100.0) == "100"
+    assert _format_value(4.5) == "4.5"
+    assert _format_value("G123") == "G123"
+
+
+def test_prompt_tables_have_no_nan_or_none():
+    data = {
+        "ctrip": {"hotels": [{"name": "A", "price": None}, {"name": None, "price": 100}]},
+        "dianping": {"restaurants": [{"name": "老厨家", "rating": float("nan")}]},
+        "missing": {},
+    }
+    prompt, _ = build_prompt(data, "哈尔滨", "2025-08-17", "2025-08-20", ["food"])
+    assert "nan" not in prompt and "None" not in prompt
+    assert "A|\n" in prompt and "|100\n" in prompt
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from scrapers.rate_limiter import AdaptiveRateLimiter
+
+
+def test_rate_rises_on_success_and_falls_on_throttle():
+    limiter = AdaptiveRateLimiter("site", 10.0, min_rate=1.0, max_rate=11.0, increase=0.5, decrease=0.5)
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 11.0
+
+    delay = limiter.on_throttle()
+    assert limiter.rate == 5.5
+    assert delay > 0 and limiter.stats()["paused_for"] > 0
+    assert limiter.throttled == 1
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.rate == 1.0
+
+
+def test_acquire_paces_requests_to_the_rate():
+    limiter = AdaptiveRateLimiter("site", 50.0)
+
+    async def main():
+        started = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    # The bucket starts with one token; each later request waits for a refill.
+    assert asyncio.run(main()) >= 4 / 50 * 0.9
+    assert limiter.waiting == 0
@@ -0,0 +1,93 @@
+import asyncio
+
+from planners.replanner import Change, build, replan
+from planners.scheduler import DaySpec, Leg, POI, schedule
+
+RESTAURANTS = list("ABCDEFGHIJ")
+
+
+def _sights(day_plans):
+    return [slot.activity for day_plan in day_plans for slot in day_plan.slots if slot.kind == "sight"]
+
+
+def _meals(day_plan):
+    return [slot.activity for slot in day_plan.slots if slot.kind == "meal"]
+
+
+def _replan(plan, change, **kwargs):
+    return asyncio.run(replan(plan, change, **kwargs))
+
+
+def _harbin_trip():
+    days = [DaySpec("8/17", "哈尔滨"), DaySpec("8/18", "哈尔滨"), DaySpec("8/19", "哈尔滨", end=15 * 60)]
+    pois = [
+        POI("中央大街", "哈尔滨", 180, priority=5),
+        POI("索菲亚教堂", "哈尔滨", 180, priority=4),
+        POI("极地馆", "哈尔滨", 180, priority=3),
+        POI("冰雪大世界", "哈尔滨", 180, priority=2),
+        POI("伏尔加庄园", "哈尔滨", 180, priority=2),
+        POI("太阳岛", "哈尔滨", 180, priority=1),
+    ]
+    return build(days, pois, RESTAURANTS)
+
+
+def test_remove_day_reschedules_later_days_and_reports_every_lost_sight():
+    plan = _harbin_trip()
+    new_plan, affected = _replan(plan, Change("remove_day", day=0))
+
+    assert affected == [0, 1]
+    assert [day.date for day in new_plan.days] == ["8/18", "8/19"]
+    lost = set(_sights(plan.day_plans)) - set(_sights(new_plan.day_plans))
+    assert lost
+    warnings = "\n".join(new_plan.day_plans[-1].warnings)
+    assert all(name in warnings for name in lost)
+    # The old plan is left untouched.
+    assert plan.day_plans[-1].warnings == []
+
+
+def test_remove_day_moves_its_legs_to_the_next_day():
+    days = [
+        DaySpec("8/17", "哈尔滨"),
+        DaySpec("8/18", "齐齐哈尔", legs=[Leg("哈尔滨", "齐齐哈尔", 210)]),
+        DaySpec("8/19", "齐齐哈尔"),
+    ]
+    pois = [POI("扎龙湿地", "齐齐哈尔", 120, priority=5), POI("明月岛", "齐齐哈尔", 120, priority=4)]
+    plan = build(days, pois, RESTAURANTS)
+    new_plan, affected = _replan(plan, Change("remove_day", day=1))
+
+    assert affected == [1]
+    assert any(slot.kind == "leg" for slot in new_plan.day_plans[1].slots)
+    assert set(_sights(new_plan.day_plans)) == {"扎龙湿地", "明月岛"}
+
+
+def test_replanned_day_matches_a_full_schedule():
+    plan = _harbin_trip()
+    change = DaySpec("8/18", "哈尔滨", start=10 * 60)
+    new_plan, affected = _replan(plan, Change("change_day", day=1, spec=change))
+
+    assert affected == [1]
+    assert new_plan.day_plans[0] is plan.day_plans[0]
+    expected = schedule(new_plan.days, new_plan.pois, RESTAURANTS)
+    assert _meals(new_plan.day_plans[1]) == _meals(expected[1])
+
+
+def test_remove_poi_only_touches_its_day_and_is_not_reported_lost():
+    plan = _harbin_trip()
+    new_plan, affected = _replan(plan, Change("remove_poi", name="中央大街"))
+
+    assert affected == [0]
+    assert "中央大街" not in _sights(new_plan.day_plans)
+    assert not any("中央大街" in warning for day_plan in new_plan.day_plans for warning in day_plan.warnings)
+
+
+def test_prose_is_written_only_for_affected_days():
+    plan = _harbin_trip()
+    written = []
+
+    async def write_prose(day_plan):
+        written.append(day_plan.date)
+        return f"prose {day_plan.date}"
+
+    new_plan, affected = _replan(plan, Change("add_poi", pois=[POI("老道外", "哈尔滨", 60)]), write_prose=write_prose)
+    assert len(written) == len(affected) == 1
+    assert new_plan.prose[affected[0]] == f"prose {written[0]}"
@@ -0,0 +1,79 @@
+from planners.scheduler import DaySpec, Leg, POI, schedule, to_minutes
+
+
+def _meals(plan):
+    return {slot.activity.split("（")[0]: slot for slot in plan.slots if slot.kind == "meal"}
+
+
+def test_lunch_is_served_in_its_window_before_a_fixed_poi():
+    days = [DaySpec("8/19", "齐齐哈尔")]
+    pois = [
+        POI("长景点", "齐齐哈尔", 140, priority=5),
+        POI("扎龙放飞", "齐齐哈尔", 30, fixed_start=to_minutes("14:00")),
+    ]
+    (plan,) = schedule(days, pois, ["老厨家"])
+
+    lunch = _meals(plan)["午餐"]
+    assert lunch.start == to_minutes("11:30")
+    assert "推迟" not in lunch.activity
+    assert any(slot.activity == "扎龙放飞" and slot.start == to_minutes("14:00") for slot in plan.slots)
+    assert plan.warnings == []
+
+
+def test_lunch_is_kept_free_before_a_timed_leg():
+    days = [DaySpec("8/18", "哈尔滨", legs=[Leg("哈尔滨", "齐齐哈尔", 180, depart=to_minutes("13:00"))])]
+    pois = [POI(f"景点{i}", "哈尔滨", 40, priority=1) for i in range(8)]
+    (plan,) = schedule(days, pois, ["老厨家"])
+
+    lunch = _meals(plan)["午餐"]
+    assert to_minutes("11:30") <= lunch.start <= to_minutes("13:30")
+    assert lunch.end <= to_minutes("13:00")
+    assert not any("错过" in warning for warning in plan.warnings)
+
+
+def test_meal_is_not_skipped_after_a_long_poi():
+    days = [DaySpec("8/17", "哈尔滨")]
+    pois = [POI("太阳岛", "哈尔滨", 300, priority=5)]
+    (plan,) = schedule(days, pois)
+
+    assert set(_meals(plan)) == {"早餐", "午餐", "晚餐"}
+    sight = next(slot for slot in plan.slots if slot.kind == "sight")
+    assert sight.start >= _meals(plan)["午餐"].end
+
+
+def test_unpinned_fixed_poi_goes_to_a_day_that_can_reach_it():
+    days = [
+        DaySpec("8/17", "哈尔滨"),
+        DaySpec("8/18", "齐齐哈尔", legs=[Leg("哈尔滨", "齐齐哈尔", 210)]),
+        DaySpec("8/19", "齐齐哈尔"),
+    ]
+    pois = [POI("扎龙放飞", "齐齐哈尔", 30, fixed_start=to_minutes("10:00"))]
+    plans = schedule(days, pois)
+
+    assert any(slot.activity == "扎龙放飞" for slot in plans[2].slots)
+    assert all(plan.warnings == [] for plan in plans)
+
+
+def test_unreachable_fixed_pois_are_reported():
+    days = [DaySpec("8/17", "哈尔滨")]
+    pois = [
+        POI("漠河日出", "漠河", 30, fixed_start=to_minutes("04:00")),
+        POI("晨跑", "哈尔滨", 30, fixed_start=to_minutes("06:00")),
+    ]
+    (plan,) = schedule(days, pois)
+
+    assert any("漠河日出" in warning for warning in plan.warnings)
+    assert any("晨跑" in warning for warning in plan.warnings)
+
+
+def test_schedule_is_deterministic():
+    days = [DaySpec("8/17", "哈尔滨")]
+    pois = [POI(name, "哈尔滨", 60) for name in ("中央大街", "索菲亚教堂", "防洪纪念塔")]
+    assert schedule(days, pois, ["A", "B"]) == schedule(days, list(reversed(pois)), ["A", "B"])
+
+
+def test_sights_finish_before_the_day_ends():
+    days = [DaySpec("8/19", "哈尔滨", end=15 * 60)]
+    pois = [POI("冰雪大世界", "哈尔滨", 180, priority=5), POI("太阳岛", "哈尔滨", 180, priority=4)]
+    day_plan = schedule(days, pois, list("ABC"))[0]
+    assert all(slot.end <= 15 * 60 for slot in day_plan.slots if slot.kind == "sight")
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from scrapers import cache
+
+
+@pytest.fixture(autouse=True)
+def scrape_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "SCRAPE_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(cache, "_conn", None)
+    yield
+    if cache._conn is not None:
+        cache._conn.close()
+
+
+def _counting_stream(runs, count=3):
+    async def stream(destination, start_date=None, end_date=None):
+        runs.append(destination)
+        for i in range(count):
+            await asyncio.sleep(0.01)
+            yield "hotel", {"name": f"{destination}-{i}", "price": 100 + i}
+    return stream
+
+
+def test_concurrent_stream_misses_share_one_scrape_and_fill_the_cache():
+    runs = []
+    stream = cache.cached_stream("ctrip", "hotel")(_counting_stream(runs))
+
+    async def run():
+        async def one():
+            return [record async for _, record in stream("哈尔滨")]
+        results = await asyncio.gather(*(one() for _ in range(5)))
+        again = [record async for _, record in stream("哈尔滨")]
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert runs == ["哈尔滨"]
+    assert all(result == results[0] for result in results) and len(results[0]) == 3
+    assert again == results[0]
+
+
+def test_stream_and_scrape_share_entries():
+    runs = []
+    stream = cache.cached_stream("ctrip", "hotel")(_counting_stream(runs))
+
+    @cache.cached("ctrip")
+    async def scrape(destination, start_date=None, end_date=None):
+        return {"hotels": [record async for _, record in _counting_stream(runs)(destination)]}
+
+    async def run():
+        [_ async for _ in stream("齐齐哈尔")]
+        return await scrape("齐齐哈尔")
+
+    assert len(asyncio.run(run())["hotels"]) == 3
+    assert runs == ["齐齐哈尔"]
+
+
+def test_unchanged_page_is_not_parsed_or_rewritten():
+    from scrapers import conditional
+
+    parses = []
+
+    def parse(html):
+        parses.append(html)
+        return {"hotels": [{"name": html}]}
+
+    key = conditional.page_key("http://example.test/hotels", {"page": 1})
+    assert asyncio.run(conditional.parse_if_changed(key, "<p>a</p>", parse, etag='"1"')) == {"hotels": [{"name": "<p>a</p>"}]}
+    before = cache._db().execute("SELECT checked_at, parsed FROM page_validators").fetchone()
+    assert asyncio.run(conditional.parse_if_changed(key, "<p>a</p>", parse)) == {"hotels": [{"name": "<p>a</p>"}]}
+    after = cache._db().execute("SELECT checked_at, parsed, etag FROM page_validators").fetchone()
+    assert len(parses) == 1
+    assert after[0] >= before[0] and after[1] == before[1] and after[2] == '"1"'
+
+
+def test_page_validators_share_the_size_cap_and_clear(monkeypatch):
+    from scrapers import conditional
+
+    monkeypatch.setattr(cache, "SCRAPE_CACHE_MAX_BYTES", 200)
+    for i in range(10):
+        conditional.store(f"page{i}", str(i), {"hotels": [{"name": "x" * 40}]})
+    cache.put("scrape", "ctrip", {"hotels": []})
+    db = cache._db()
+    total = db.execute(
+        "SELECT (SELECT SUM(size) FROM scrape_cache) + (SELECT SUM(size) FROM page_validators)"
+    ).fetchone()[0]
+    assert total <= 200
+    assert conditional.lookup("page9") is not None and conditional.lookup("page0") is None
+
+    cache.clear()
+    assert db.execute("SELECT COUNT(*) FROM page_validators").fetchone()[0] == 0
@@ -0,0 +1,90 @@
+import asyncio
+
+from singleflight import SingleFlight, _Broadcast
+
+
+def test_concurrent_streams_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    async def numbers():
+        runs.append(1)
+        for i in range(5):
+            await asyncio.sleep(0)
+            yield i
+
+    async def collect():
+        return [item async for item in flight.stream("key", numbers)]
+
+    async def main():
+        return await asyncio.gather(*(collect() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert results == [list(range(5))] * 5
+    assert len(runs) == 1
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "shared": 4}
+
+
+def test_broadcast_drops_consumed_items_past_the_replay_limit():
+    async def main():
+        produced = asyncio.Event()
+        release = asyncio.Event()
+
+        async def numbers():
+            for i in range(10):
+                yield i
+            produced.set()
+            await release.wait()
+
+        broadcast = _Broadcast(numbers(), replay_limit=4)
+        received = []
+
+        async def consume():
+            async for item in broadcast.subscribe(broadcast.join()):
+                received.append(item)
+
+        consumer = asyncio.ensure_future(consume())
+        runner = asyncio.ensure_future(broadcast.run())
+        await produced.wait()
+        while len(received) < 10:
+            await asyncio.sleep(0)
+        retained, joinable = len(broadcast.items), broadcast.joinable
+        release.set()
+        await asyncio.gather(runner, consumer)
+        return received, retained, joinable
+
+    received, retained, joinable = asyncio.run(main())
+    assert received == list(range(10))
+    assert retained == 0
+    assert not joinable
+
+
+def test_late_caller_starts_a_fresh_run_once_items_were_dropped():
+    flight = SingleFlight()
+    runs = []
+
+    async def main():
+        first_done = asyncio.Event()
+        release = asyncio.Event()
+
+        async def numbers():
+            runs.append(1)
+            for i in range(300):
+                yield i
+            first_done.set()
+            await release.wait()
+
+        async def collect():
+            return [item async for item in flight.stream("key", numbers)]
+
+        first = asyncio.ensure_future(collect())
+        await first_done.wait()
+        await asyncio.sleep(0)
+        late = asyncio.ensure_future(collect())
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(first, late)
+
+    first, late = asyncio.run(main())
+    assert first == late == list(range(300))
+    assert len(runs) == 2
@@ -0,0 +1,105 @@
+"""Planner 延迟/吞吐基准：用本地 FakeBackend 代替 OpenAI，压测 plan_stream()。
+
+按给定并发发起若干次规划请求（目的地在 --distinct 个之间轮转，用于观察
+plan cache 与 single-flight 合并的效果），输出吞吐、首 token 延迟 (TTFT)、
+总延迟分位数与错误数。plan_stream() 按天输出，TTFT 以收到首个日程块计。
+不需要网络。
+
+用法示例：
+  python tools/bench/bench_planner.py --requests 200 --concurrency 20 --ttft 0.4 --tps 60 --error-rate 0.02
+  python tools/bench/bench_planner.py --distinct 10 --no-cache
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+sys.path.insert(0, BASE_DIR)
+
+from metrics import latency_summary  # noqa: E402
+from planners import llm, trip_planner  # noqa: E402
+from planners.ranking import RecordCollector  # noqa: E402
+
+
+def sample_data(interests, count=20):
+    """构造与 main.collect() 相同结构的抓取结果（RecordCollector.to_data()），让 prompt 构建走真实路径。"""
+    collector = RecordCollector(interests)
+    for i in range(count):
+        collector.add("ctrip", "hotel", {"name": f"酒店{i}", "price": 200 + 37 * i % 500, "location": "市中心"})
+        collector.add("dianping", "restaurant", {"name": f"餐厅{i}", "rating": 3.5 + i % 15 / 10, "cuisine": "food"})
+        collector.add("hsr", "train", {"number": f"G{100 + i}", "departure": f"{6 + i % 14:02d}:00",
+                                       "arrival": f"{8 + i % 14:02d}:30"})
+    return collector.to_data()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Planner 延迟/吞吐基准")
+    parser.add_argument('--requests', type=int, default=100, help='规划请求总数')
+    parser.add_argument('--concurrency', type=int, default=10, help='同时进行的请求数')
+    parser.add_argument('--distinct', type=int, default=0, help='不同目的地的数量，0 表示每个请求都不同')
+    parser.add_argument('--days', type=int, default=3, help='每个行程的天数')
+    parser.add_argument('--ttft', type=float, default=0.4, help='模拟首 token 延迟中位数(秒)')
+    parser.add_argument('--tps', type=float, default=60.0, help='模拟生成速率(token/秒)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='模拟失败概率')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-cache', action='store_true', help='每个请求前清空 plan cache')
+    return parser.parse_args()
+
+
+async def run(args):
+    ttfts = []
+    latencies = []
+    failures = []
+    slots = asyncio.Semaphore(args.concurrency)
+    data = sample_data(["food"])
+    end_date = f"2025-08-{args.days:02d}"
+
+    async def one(i):
+        destination = f"city{i % args.distinct if args.distinct else i}"
+        async with slots:
+            if args.no_cache:
+                trip_planner.plan_cache.clear()
+            started = time.perf_counter()
+            first = None
+            try:
+                async for _ in trip_planner.plan_stream(data, destination, "2025-08-01", end_date, ["food"]):
+                    if first is None:
+                        first = time.perf_counter() - started
+            except llm.LLMError as e:
+                failures.append(f"{destination}: {e}")
+                return
+            if first is not None:
+                ttfts.append(first)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    return time.perf_counter() - started, ttfts, latencies, failures
+
+
+def main():
+    args = parse_args()
+    backend = llm.FakeBackend(args.ttft, args.tps, args.error_rate, seed=args.seed)
+    llm.set_backend(backend)
+
+    elapsed, ttfts, latencies, failures = asyncio.run(run(args))
+
+    ttft = latency_summary(ttfts)
+    total = latency_summary(latencies)
+    cache = trip_planner.plan_cache.stats()
+    print(f"\n模拟模型: TTFT {args.ttft}s, {args.tps} token/s, 错误率 {args.error_rate}")
+    print(f"请求: {args.requests}, 并发: {args.concurrency}, 成功: {total['count']}, 失败: {len(failures)}")
+    print(f"总耗时: {elapsed:.2f}s, 吞吐 {total['count'] / elapsed:.1f} plans/s, 模型调用 {backend.calls} 次")
+    print(f"TTFT(首个日程块): p50 {ttft['p50'] * 1000:.0f}ms, p95 {ttft['p95'] * 1000:.0f}ms, p99 {ttft['p99'] * 1000:.0f}ms")
+    print(f"总延迟: p50 {total['p50']:.2f}s, p95 {total['p95']:.2f}s, p99 {total['p99']:.2f}s")
+    print(f"plan cache: {cache}")
+    print(f"single-flight: {trip_planner.plan_flights.stats()}")
+    for failure in failures[:5]:
+        print(f"失败: {failure}")
+
+
+if __name__ == '__main__':
+    main()
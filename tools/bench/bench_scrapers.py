@@ -0,0 +1,128 @@
+"""Scraper 吞吐基准：用真实的 scrapers 代码压测本地模拟站点。
+
+启动 mock_travel_server（后台线程），把 Ctrip / HSR / Dianping 的 base URL 指向它，
+按给定并发执行若干次 scrape()，输出 pages/s、单页与单次 scrape 的延迟分位数；
+内存峰值在另一轮开启 tracemalloc 的运行中测量，不影响吞吐数据。
+
+用法示例：
+  python tools/bench/bench_scrapers.py --scrapes 60 --concurrency 12 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，只报告 tracemalloc 峰值
+    resource = None
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+# 每次运行使用独立的缓存库，避免命中上次的抓取缓存
+os.environ["SCRAPE_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench_scrapers_"), "cache.sqlite3")
+
+import config  # noqa: E402
+from metrics import latency_summary  # noqa: E402
+from mock_travel_server import MockSiteConfig, start_server  # noqa: E402
+from scrapers import http_client, orchestrator, rate_limiter  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scraper 吞吐基准")
+    parser.add_argument('--scrapes', type=int, default=30, help='scrape() 调用总次数（按数据源轮转）')
+    parser.add_argument('--concurrency', type=int, default=10, help='同时进行的 scrape() 数')
+    parser.add_argument('--sources', default='ctrip,hsr,dianping', help='参与压测的数据源')
+    parser.add_argument('--latency', type=float, default=0.05, help='模拟站点单页延迟(秒)')
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-rps', type=float, default=0.0, help='模拟站点限流阈值，0 表示不限')
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--per-page', type=int, default=30)
+    parser.add_argument('--rate', type=float, default=1000.0, help='各数据源限流器的初始速率(请求/秒)')
+    parser.add_argument('--no-memory', action='store_true', help='跳过单独的内存测量轮')
+    return parser.parse_args()
+
+
+async def run(args, base_url, offset=0):
+    sources = [name.strip() for name in args.sources.split(',') if name.strip()]
+    page_latencies = []
+    scrape_latencies = []
+    failures = []
+    request = http_client.request
+
+    async def timed_request(method, url, source=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await request(method, url, source=source, **kwargs)
+        finally:
+            page_latencies.append(time.perf_counter() - started)
+
+    http_client.request = timed_request
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        source = sources[i % len(sources)]
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await orchestrator.SOURCES[source].scrape(f"city{offset + i}")
+            except Exception as e:
+                failures.append(f"{source}: {type(e).__name__}: {e}")
+            scrape_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(args.scrapes)))
+    finally:
+        http_client.request = request
+        await http_client.close()
+    return time.perf_counter() - started, page_latencies, scrape_latencies, failures
+
+
+def main():
+    args = parse_args()
+    site = MockSiteConfig(args.latency, args.jitter, args.error_rate, args.max_rps, args.pages, args.per_page)
+    server, base_url, server_stats = start_server(site)
+    for name in config.SCRAPER_BASE_URLS:
+        config.SCRAPER_BASE_URLS[name] = base_url
+        limiter = rate_limiter.get_limiter(name)
+        limiter.rate = limiter.max_rate = args.rate
+
+    # 吞吐与延迟在不开 tracemalloc 的一轮里测；内存峰值另跑一轮（换一批城市，不命中缓存）
+    elapsed, page_latencies, scrape_latencies, failures = asyncio.run(run(args, base_url))
+    peak = None
+    if not args.no_memory:
+        tracemalloc.start()
+        asyncio.run(run(args, base_url, offset=args.scrapes))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    server.shutdown()
+
+    pages = latency_summary(page_latencies)
+    scrapes = latency_summary(scrape_latencies)
+    print(f"\n模拟站点: {base_url}  延迟 {args.latency}s±{args.jitter}s, 错误率 {args.error_rate}, 限流 {args.max_rps or '无'} rps")
+    print(f"scrape() 次数: {args.scrapes}, 并发: {args.concurrency}, 失败: {len(failures)}")
+    print(f"总耗时: {elapsed:.2f}s")
+    print(f"页面请求: {pages['count']} ({pages['count'] / elapsed:.1f} pages/s), "
+          f"服务端收到 {server_stats['requests']}, 429 {server_stats['throttled']}, 500 {server_stats['errors']}")
+    print(f"单页延迟: p50 {pages['p50'] * 1000:.1f}ms, p95 {pages['p95'] * 1000:.1f}ms, p99 {pages['p99'] * 1000:.1f}ms")
+    print(f"单次 scrape: p50 {scrapes['p50']:.3f}s, p95 {scrapes['p95']:.3f}s, p99 {scrapes['p99']:.3f}s")
+    memory = f"内存: Python 分配峰值 {peak / 1024 / 1024:.1f} MiB" if peak is not None else "内存: 未测量"
+    if resource is not None:
+        memory += f", 进程 RSS 峰值 {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB"
+    print(memory)
+    for source, stats in rate_limiter.stats().items():
+        print(f"限流器 {source}: 速率 {stats['rate']} req/s, 被限流 {stats['throttled']} 次")
+    for failure in failures[:5]:
+        print(f"失败: {failure}")
+
+
+if __name__ == '__main__':
+    main()
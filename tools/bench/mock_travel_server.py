@@ -0,0 +1,180 @@
+"""本地模拟旅游站点（携程 / 12306 / 大众点评 的替身），用于压测 scrapers。
+
+提供与 scrapers/*_scraper.py 解析规则一致的列表页：
+  /hotels?city=哈尔滨&page=1
+  /restaurants?city=哈尔滨&page=1
+  /trains?to=哈尔滨&page=1
+
+可配置延迟、错误率、限流（超过每秒请求数返回 429）以及每个城市的页数与每页条数。
+内容按 (路径, 城市, 页码) 确定性生成，并支持 ETag / If-None-Match。
+
+用法示例：
+  python tools/bench/mock_travel_server.py --port 8800 --latency 0.05 --error-rate 0.01 --max-rps 200
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+class MockSiteConfig:
+    def __init__(self, latency=0.05, jitter=0.02, error_rate=0.0, max_rps=0.0, pages=5, per_page=30):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.pages = pages
+        self.per_page = per_page
+
+
+def _rng(*parts):
+    seed = hashlib.md5("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def render_listing(path, city, page, per_page):
+    """
+    生成一页列表的 HTML；结构与各 scraper 的 parse() 对应。
+    """
+    rng = _rng(path, city, page)
+    items = []
+    for i in range(per_page):
+        if path == "/hotels":
+            items.append(
+                f'<li class="hotel"><span class="name">{city}酒店{page}-{i}</span>'
+                f'<span class="price">{rng.randint(150, 1500)}</span></li>'
+            )
+        elif path == "/restaurants":
+            items.append(
+                f'<li class="restaurant"><span class="name">{city}餐厅{page}-{i}</span>'
+                f'<span class="rating">{rng.randint(30, 50) / 10:.1f}</span></li>'
+            )
+        elif path == "/trains":
+            dep = rng.randint(6 * 60, 21 * 60)
+            arr = dep + rng.randint(60, 300)
+            items.append(
+                f'<li class="train"><span class="number">G{rng.randint(1, 9999)}</span>'
+                f'<span class="departure">{dep // 60:02d}:{dep % 60:02d}</span>'
+                f'<span class="arrival">{arr // 60 % 24:02d}:{arr % 60:02d}</span></li>'
+            )
+    # 页面附带一些装饰性内容，使解析成本接近真实页面
+    filler = "<div class='ad'>" + "推荐内容 " * 200 + "</div>"
+    return f"<html><body>{filler}<ul>{''.join(items)}</ul>{filler}</body></html>"
+
+
+class _Throttle:
+    """按 1 秒滑动窗口统计请求数，超过 max_rps 即限流。"""
+
+    def __init__(self, max_rps):
+        self.max_rps = max_rps
+        self.lock = threading.Lock()
+        self.hits = []
+
+    def allow(self):
+        if not self.max_rps:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            self.hits = [t for t in self.hits if now - t < 1.0]
+            if len(self.hits) >= self.max_rps:
+                return False
+            self.hits.append(now)
+            return True
+
+
+def make_handler(config, stats):
+    throttle = _Throttle(config.max_rps)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 头和正文分两次写出，keep-alive 下 Nagle + 延迟 ACK 会给每个请求多出约 40ms
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query)
+            with stats["lock"]:
+                stats["requests"] += 1
+            if parts.path not in ("/hotels", "/restaurants", "/trains"):
+                self._send(404)
+                return
+            if not throttle.allow():
+                with stats["lock"]:
+                    stats["throttled"] += 1
+                self._send(429, headers={"Retry-After": "1"})
+                return
+            time.sleep(max(0.0, config.latency + random.uniform(-config.jitter, config.jitter)))
+            if random.random() < config.error_rate:
+                with stats["lock"]:
+                    stats["errors"] += 1
+                self._send(500)
+                return
+
+            city = (query.get("city") or query.get("to") or [""])[0]
+            page = int((query.get("page") or ["1"])[0])
+            html = "" if page > config.pages else render_listing(parts.path, city, page, config.per_page)
+            body = html.encode("utf-8")
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+                return
+            self._send(200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_server(config=None, host="127.0.0.1", port=0):
+    """
+    在后台线程启动模拟站点，返回 (server, base_url, stats)。
+    port=0 时自动选择空闲端口。
+    """
+    config = config or MockSiteConfig()
+    stats = {"requests": 0, "throttled": 0, "errors": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer((host, port), make_handler(config, stats))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}", stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="本地模拟旅游站点")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, default=0.05, help='每个请求的平均延迟(秒)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='延迟抖动(秒)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回 500 的概率')
+    parser.add_argument('--max-rps', type=float, default=0.0, help='每秒最大请求数，超过返回 429；0 表示不限')
+    parser.add_argument('--pages', type=int, default=5, help='每个城市的列表页数')
+    parser.add_argument('--per-page', type=int, default=30, help='每页条数')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    config = MockSiteConfig(args.latency, args.jitter, args.error_rate, args.max_rps, args.pages, args.per_page)
+    server, base_url, _ = start_server(config, args.host, args.port)
+    print(f"模拟站点已启动: {base_url}  (Ctrl+C 退出)")
+    print(f"  set CTRIP_BASE_URL={base_url}")
+    print(f"  set HSR_BASE_URL={base_url}")
+    print(f"  set DIANPING_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
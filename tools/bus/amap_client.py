@@ -0,0 +1,371 @@
+"""高德 Web 服务 API 的共享客户端。
+
+所有 tools/bus 脚本都通过这里访问高德：一个带连接池的 requests.Session（keep-alive），
+统一的超时、失败重试与退避，以及地理编码 / 公交路线 / POI / 公交线路返回值的类型化解析。
+地理编码、POI 搜索和公交线路查询先查 geo_cache（见 CACHE_TTLS）。
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from geo_cache import CACHE_PATH, NOT_FOUND, GeoCache, normalize
+
+BASE_URL = 'https://restapi.amap.com'
+# (连接超时, 读取超时)，单位秒
+TIMEOUT = (3.05, 10)
+# 连接池大小，应不小于并发请求数
+POOL_SIZE = 16
+# 网络错误与 5xx 的重试次数，退避为 BACKOFF * 2^n 秒
+MAX_RETRIES = 3
+BACKOFF = 0.5
+# 高德以 HTTP 200 + infocode 报告限流，这些 infocode 同样退避重试
+THROTTLE_INFOCODES = {'10004', '10014', '10015', '10019', '10020', '10021'}
+# 每秒最多发出的请求数（按 key 的配额设置），并发请求会排队
+MAX_QPS = 20
+# 批量地理编码每个请求最多 10 个地址，用 | 分隔
+GEOCODE_BATCH_SIZE = 10
+# 同时进行的批量请求数
+GEOCODE_BATCH_WORKERS = 4
+# 公交优先
+TRANSIT_STRATEGY = 5
+# 各接口结果的缓存时间(秒)；不在表中的接口（路线、实时公交）不缓存
+DAY = 24 * 3600
+CACHE_TTLS = {
+    '/v3/geocode/geo': 90 * DAY,
+    '/v3/place/text': 7 * DAY,
+    '/v3/bus/linename': 7 * DAY,
+}
+# "查不到" 的缓存时间(秒)
+NEGATIVE_TTL = DAY
+
+
+class AmapError(Exception):
+    """高德返回 status != 1。"""
+
+    def __init__(self, info, infocode=None):
+        super().__init__(f'{info} (infocode={infocode})')
+        self.info = info
+        self.infocode = infocode
+
+
+def _text(value):
+    # 高德把空字段返回为 []
+    return value if isinstance(value, str) else ''
+
+
+def _int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass(frozen=True, slots=True)
+class Location:
+    lng: float
+    lat: float
+
+    @classmethod
+    def parse(cls, value):
+        """解析 "lng,lat"，空值返回 None。"""
+        value = _text(value)
+        if not value:
+            return None
+        lng, lat = value.split(',')
+        return cls(float(lng), float(lat))
+
+    def __str__(self):
+        # 高德接口参数的格式
+        return f'{self.lng:.6f},{self.lat:.6f}'
+
+
+@dataclass(slots=True)
+class Geocode:
+    address: str
+    formatted_address: str
+    location: Location
+    level: str = ''
+    city: str = ''
+
+    @classmethod
+    def parse(cls, address, item):
+        return cls(address, _text(item.get('formatted_address')), Location.parse(item.get('location')),
+                   _text(item.get('level')), _text(item.get('city')))
+
+
+@dataclass(slots=True)
+class Poi:
+    id: str
+    name: str
+    address: str
+    location: Location
+    type: str = ''
+
+    @classmethod
+    def parse(cls, item):
+        return cls(_text(item.get('id')), _text(item.get('name')), _text(item.get('address')),
+                   Location.parse(item.get('location')), _text(item.get('type')))
+
+
+@dataclass(slots=True)
+class Stop:
+    name: str
+    location: Location
+
+    @classmethod
+    def parse(cls, item):
+        if not item or not _text(item.get('location')):
+            return None
+        return cls(_text(item.get('name')) or '公交站', Location.parse(item['location']))
+
+
+@dataclass(slots=True)
+class BusLine:
+    name: str
+    departure_stop: Stop
+    arrival_stop: Stop
+    via_stops: list = field(default_factory=list)
+    polyline: str = ''
+    duration: int = 0
+    start_time: str = ''
+    end_time: str = ''
+
+    @classmethod
+    def parse(cls, item):
+        return cls(
+            _text(item.get('name')),
+            Stop.parse(item.get('departure_stop')),
+            Stop.parse(item.get('arrival_stop')),
+            [stop for stop in map(Stop.parse, item.get('via_stops') or []) if stop],
+            _text(item.get('polyline')),
+            _int(item.get('duration')),
+            _text(item.get('start_time')),
+            _text(item.get('end_time')),
+        )
+
+    def stops(self):
+        """上车站、途经站、下车站（按顺序）。"""
+        return [stop for stop in [self.departure_stop, *self.via_stops, self.arrival_stop] if stop]
+
+
+@dataclass(slots=True)
+class Segment:
+    walking_distance: int = 0
+    # 步行段每一步的 polyline 字符串
+    walking_polylines: list = field(default_factory=list)
+    buslines: list = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, item):
+        walking = item.get('walking') or {}
+        bus = item.get('bus') or {}
+        return cls(
+            _int(walking.get('distance')),
+            [_text(step.get('polyline')) for step in walking.get('steps') or [] if _text(step.get('polyline'))],
+            [BusLine.parse(line) for line in bus.get('buslines') or []],
+        )
+
+    @property
+    def type(self):
+        return 'walk' if self.walking_polylines else 'bus' if self.buslines else 'other'
+
+
+@dataclass(slots=True)
+class Transit:
+    duration: int
+    walking_distance: int
+    cost: str
+    segments: list
+
+    @classmethod
+    def parse(cls, item):
+        return cls(_int(item.get('duration')), _int(item.get('walking_distance')), _text(item.get('cost')),
+                   [Segment.parse(segment) for segment in item.get('segments') or []])
+
+
+class AmapClient:
+    def __init__(self, key, base_url=BASE_URL, timeout=TIMEOUT, pool_size=POOL_SIZE,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF, max_qps=MAX_QPS, cache=None):
+        self.key = key
+        self.cache = cache
+        self.interval = 1 / max_qps if max_qps else 0
+        self._next_slot = 0.0
+        self._slot_lock = threading.Lock()
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.requests = 0
+        self.session = requests.Session()
+        retry = Retry(total=max_retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({'GET'}))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _throttle(self):
+        # 按 max_qps 给每个请求分配发出时间，保证不超出配额
+        if not self.interval:
+            return
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def get(self, path, **params):
+        """GET 一个高德接口，返回解析后的 JSON；status != 1 时抛出 AmapError。"""
+        params['key'] = self.key
+        for attempt in range(self.max_retries + 1):
+            self._throttle()
+            resp = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            self.requests += 1
+            resp.raise_for_status()
+            data = resp.json()
+            # v4 接口使用 errcode 而不是 status
+            if data.get('status') == '1' or data.get('errcode') == 0:
+                return data
+            infocode = str(data.get('infocode') or data.get('errcode') or '')
+            if infocode not in THROTTLE_INFOCODES or attempt == self.max_retries:
+                raise AmapError(data.get('info') or data.get('errmsg') or 'unknown error', infocode)
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def cached(self, path, city, query, fetch):
+        """先查缓存；未命中时调用 fetch() 并写回，fetch() 返回空值时做负缓存。"""
+        if self.cache is None:
+            return fetch()
+        hit, value = self.cache.get(path, city or '', query)
+        if hit:
+            return value
+        value = fetch() or NOT_FOUND
+        self.cache.put(path, city or '', query, value, CACHE_TTLS[path] if value is not NOT_FOUND else NEGATIVE_TTL)
+        return value
+
+    def geocode(self, address, city=None):
+        """地址转坐标，找不到时返回 None。"""
+        def fetch():
+            geocodes = self.get('/v3/geocode/geo', address=address, city=city).get('geocodes') or []
+            return geocodes[0] if geocodes and _text(geocodes[0].get('location')) else None
+
+        item = self.cached('/v3/geocode/geo', city, address, fetch)
+        return Geocode.parse(address, item) if item else None
+
+    def geocode_batch(self, addresses, city=None, max_workers=GEOCODE_BATCH_WORKERS):
+        """
+        批量地理编码，返回与 addresses 一一对应的 Geocode / None。
+
+        addresses 的元素为地址字符串或 (地址, 城市)。先查缓存，剩下的按城市分组去重，
+        每 GEOCODE_BATCH_SIZE 个一批（batch=true）并发请求，结果写回缓存。
+        某批请求出错（AmapError 或网络错误）时改为逐个查询；单个地址仍出错则该地址返回 None 且不写缓存，
+        不影响其他地址。
+        """
+        queries = [(item, city) if isinstance(item, str) else item for item in addresses]
+        results = {}
+        pending = {}
+        for address, address_city in queries:
+            key = (normalize(address_city or ''), normalize(address))
+            if key in results or key in pending:
+                continue
+            hit, item = self.cache.get('/v3/geocode/geo', address_city or '', address) if self.cache else (False, None)
+            if hit:
+                results[key] = item
+            else:
+                pending[key] = (address, address_city)
+
+        by_city = {}
+        for key, (address, address_city) in pending.items():
+            by_city.setdefault(address_city, []).append((key, address))
+        batches = [(address_city, group[i:i + GEOCODE_BATCH_SIZE])
+                   for address_city, group in by_city.items()
+                   for i in range(0, len(group), GEOCODE_BATCH_SIZE)]
+
+        def fetch_one(address, address_city):
+            # 出错返回 None（与"未找到"区分，不写缓存）
+            try:
+                return self.get('/v3/geocode/geo', address=address, city=address_city).get('geocodes') or [None]
+            except (AmapError, requests.RequestException) as e:
+                print(f"地理编码失败 {address_city or ''} {address}: {e}")
+                return None
+
+        def fetch(batch):
+            address_city, group = batch
+            # 地址中的 | 会被当作分隔符
+            joined = '|'.join(address.replace('|', ' ') for _, address in group)
+            try:
+                geocodes = self.get('/v3/geocode/geo', address=joined, city=address_city, batch='true').get('geocodes') or []
+            except (AmapError, requests.RequestException):
+                geocodes = None
+            if geocodes is None or len(geocodes) != len(group):
+                # 批量请求失败或无法按位置对应时逐个查询
+                return [(key, fetch_one(address, address_city)) for key, address in group]
+            return [(key, [item]) for (key, _), item in zip(group, geocodes)]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for batch, fetched in zip(batches, pool.map(fetch, batches)):
+                address_city = batch[0]
+                for key, items in fetched:
+                    if items is None:
+                        results[key] = None
+                        continue
+                    item = items[0] if items and items[0] and _text(items[0].get('location')) else NOT_FOUND
+                    results[key] = item
+                    if self.cache:
+                        self.cache.put('/v3/geocode/geo', address_city or '', pending[key][0], item,
+                                       CACHE_TTLS['/v3/geocode/geo'] if item is not NOT_FOUND else NEGATIVE_TTL)
+
+        geos = []
+        for address, address_city in queries:
+            item = results[(normalize(address_city or ''), normalize(address))]
+            geos.append(Geocode.parse(address, item) if item else None)
+        return geos
+
+    def transit(self, origin, destination, city, strategy=TRANSIT_STRATEGY, cityd=None):
+        """公交路线规划，origin / destination 为 Location 或 "lng,lat"，跨城时给出终点城市 cityd；返回 Transit 列表。"""
+        data = self.get('/v3/direction/transit/integrated', origin=str(origin), destination=str(destination),
+                        city=city, cityd=cityd, strategy=strategy)
+        route = data.get('route') or {}
+        return [Transit.parse(item) for item in route.get('transits') or []]
+
+    def search_poi(self, keywords, city=None, limit=5):
+        """POI 关键字搜索。"""
+        items = self.cached('/v3/place/text', city, f'{keywords}#{limit}',
+                            lambda: self.get('/v3/place/text', keywords=keywords, city=city, offset=limit).get('pois'))
+        return [Poi.parse(item) for item in items or []]
+
+    def bus_lines(self, line_name, city):
+        """按线路名查询公交线路，返回 [(id, name)]。"""
+        lines = self.cached('/v3/bus/linename', city, line_name,
+                            lambda: self.get('/v3/bus/linename', keywords=line_name, city=city).get('buslines'))
+        return [(_text(line.get('id')), _text(line.get('name'))) for line in lines or []]
+
+    def bus_realtime(self, line_id, city):
+        """实时公交到站信息，返回站点列表（原始字典）。"""
+        data = self.get('/v4/bus/bus_realtime', lineid=line_id, city=city)
+        return (data.get('data') or {}).get('stations') or []
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(key=None, cache_path=CACHE_PATH):
+    """返回进程内共享的客户端；key 默认取 local_config.amap_key，cache_path 为空时不缓存。"""
+    if key is None:
+        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+        from local_config import amap_key as key
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = AmapClient(key, cache=GeoCache(cache_path) if cache_path else None)
+        return _clients[key]
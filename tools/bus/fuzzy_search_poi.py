@@ -1,25 +1,16 @@
-import requests
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from local_config import amap_key
+from amap_client import get_client
 
 def fuzzy_search_poi(city, keywords, amap_key):
-    url = 'https://restapi.amap.com/v3/place/text'
-    params = {
-        'city': city,
-        'keywords': keywords,
-        'key': amap_key,
-        'offset': 5
-    }
-    resp = requests.get(url, params=params).json()
-    print(f"POI模糊搜索接口返回({keywords}):", resp)
-    pois = resp.get('pois', [])
+    pois = get_client(amap_key).search_poi(keywords, city, limit=5)
     if not pois:
         print('未找到相关POI')
         return
     for i, poi in enumerate(pois):
-        print(f"{i+1}. 名称: {poi.get('name')}, 地址: {poi.get('address')}, 坐标: {poi.get('location')}")
+        print(f"{i+1}. 名称: {poi.name}, 地址: {poi.address}, 坐标: {poi.location}")
 
 if __name__ == '__main__':
     city = '北京'
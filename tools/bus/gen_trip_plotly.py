@@ -3,6 +3,7 @@ import plotly.io as pio
 import os
 import sys
 import json
+from polyline import LAT, LNG, from_stops
 
 # 用法：python gen_trip_plotly.py route.json output.html
 # route.json 格式参考 generate_route_map.py 的数据结构
@@ -13,21 +14,16 @@ def load_route_data(route_json_path):
 
 def plot_route(route_data, output_html):
     # 解析数据
-    points = []
-    names = []
+    stops = []
     colors = []
     for seg in route_data.get('segments', []):
-        for idx, stop in enumerate(seg.get('stops', [])):
-            points.append((stop['lat'], stop['lng']))
-            names.append(stop['name'])
-            if seg['type'] == 'bus':
-                colors.append('blue')
-            elif seg['type'] == 'walk':
-                colors.append('green')
-            else:
-                colors.append('gray')
-    lats = [p[0] for p in points]
-    lngs = [p[1] for p in points]
+        stops.extend(seg.get('stops', []))
+        color = {'bus': 'blue', 'walk': 'green'}.get(seg['type'], 'gray')
+        colors.extend([color] * len(seg.get('stops', [])))
+    names = [stop['name'] for stop in stops]
+    points = from_stops(stops)
+    lats = points[:, LAT]
+    lngs = points[:, LNG]
 
     # 创建图形
     fig = go.Figure()
@@ -41,18 +37,18 @@ def plot_route(route_data, output_html):
         line=dict(width=4, color='blue'),
     ))
     # 标注起点终点
-    if points:
+    if len(points):
         fig.add_trace(go.Scattermapbox(
-            lat=[points[0][0]],
-            lon=[points[0][1]],
+            lat=[points[0, LAT]],
+            lon=[points[0, LNG]],
             mode='markers',
             marker=dict(size=16, color='red'),
             text=['起点'],
             hoverinfo='text',
         ))
         fig.add_trace(go.Scattermapbox(
-            lat=[points[-1][0]],
-            lon=[points[-1][1]],
+            lat=[points[-1, LAT]],
+            lon=[points[-1, LNG]],
             mode='markers',
             marker=dict(size=16, color='orange'),
             text=['终点'],
@@ -61,7 +57,7 @@ def plot_route(route_data, output_html):
     fig.update_layout(
         mapbox_style="open-street-map",
         mapbox_zoom=12,
-        mapbox_center={"lat": points[0][0] if points else 39.9, "lon": points[0][1] if points else 116.4},
+        mapbox_center={"lat": points[0, LAT] if len(points) else 39.9, "lon": points[0, LNG] if len(points) else 116.4},
         margin={"r":0,"t":0,"l":0,"b":0},
         font=dict(family="Microsoft YaHei, SimHei, Arial", size=16),
     )
@@ -1,80 +1,56 @@
-import requests
 import sys
 import os
 import folium
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from local_config import amap_key
+from amap_client import AmapError, Location, get_client
+from polyline import concat, decode, latlng
 
 def get_route_data(city, origin, destination_coord, amap_key):
-    def geocode(address):
-        url = 'https://restapi.amap.com/v3/geocode/geo'
-        params = {
-            'address': address,
-            'city': city,
-            'key': amap_key
-        }
-        resp = requests.get(url, params=params).json()
-        if resp.get('status') == '1' and resp.get('geocodes'):
-            return resp['geocodes'][0]['location']
-        else:
-            return None
-    origin_loc = geocode(origin)
-    if not origin_loc:
+    client = get_client(amap_key)
+    try:
+        origin_geo = client.geocode(origin, city)
+    except AmapError as e:
+        print(f"地理编码接口错误({origin}):", e)
+        origin_geo = None
+    if not origin_geo:
         print('地理编码失败')
         return None, None, None
-    destination_loc = destination_coord
-    route_url = 'https://restapi.amap.com/v3/direction/transit/integrated'
-    route_params = {
-        'origin': origin_loc,
-        'destination': destination_loc,
-        'city': city,
-        'strategy': 5,
-        'key': amap_key
-    }
-    route_resp = requests.get(route_url, params=route_params).json()
-    return origin_loc, destination_loc, route_resp
+    destination_loc = Location.parse(destination_coord)
+    try:
+        transits = client.transit(origin_geo.location, destination_loc, city)
+    except AmapError as e:
+        print('公交路线规划接口错误:', e)
+        transits = []
+    return origin_geo.location, destination_loc, transits
 
 def plot_route_map(city, origin, destination_coord, amap_key, output_file='route_map.html'):
-    origin_loc, destination_loc, route_resp = get_route_data(city, origin, destination_coord, amap_key)
+    origin_loc, destination_loc, transits = get_route_data(city, origin, destination_coord, amap_key)
     if not origin_loc or not destination_loc:
         print('地理编码失败，无法生成地图')
         return
-    if not route_resp or route_resp.get('status') != '1' or not route_resp.get('route'):
-        print('未找到公交路线')
-        return
-    transits = route_resp['route'].get('transits', [])
     if not transits:
         print('未找到公交路线')
         return
     transit = transits[0]
     # 起点和终点坐标
-    origin_lat, origin_lng = map(float, origin_loc.split(','))
-    dest_lat, dest_lng = map(float, destination_loc.split(','))
-    m = folium.Map(location=[(origin_lng+dest_lng)/2, (origin_lat+dest_lat)/2], zoom_start=13)
-    folium.Marker([origin_lng, origin_lat], popup='起点: '+origin, icon=folium.Icon(color='green')).add_to(m)
-    folium.Marker([dest_lng, dest_lat], popup='终点: 管氏翅吧(上地店)', icon=folium.Icon(color='red')).add_to(m)
+    m = folium.Map(location=[(origin_loc.lat+destination_loc.lat)/2, (origin_loc.lng+destination_loc.lng)/2], zoom_start=13)
+    folium.Marker([origin_loc.lat, origin_loc.lng], popup='起点: '+origin, icon=folium.Icon(color='green')).add_to(m)
+    folium.Marker([destination_loc.lat, destination_loc.lng], popup='终点: 管氏翅吧(上地店)', icon=folium.Icon(color='red')).add_to(m)
     # 绘制公交和步行段
-    for segment in transit.get('segments', []):
+    for segment in transit.segments:
         # 步行段
-        walking = segment.get('walking', {})
-        if 'steps' in walking:
-            for step in walking['steps']:
-                polyline = step.get('polyline', '')
-                points = [list(map(float, p.split(','))) for p in polyline.split(';') if p]
-                if points:
-                    folium.PolyLine(points, color='blue', weight=3, opacity=0.7, popup='步行').add_to(m)
+        points = concat(segment.walking_polylines)
+        if len(points):
+            folium.PolyLine(latlng(points).tolist(), color='blue', weight=3, opacity=0.7, popup='步行').add_to(m)
         # 公交段
-        bus = segment.get('bus', {})
-        for busline in bus.get('buslines', []):
-            polyline = busline.get('polyline', '')
-            points = [list(map(float, p.split(','))) for p in polyline.split(';') if p]
-            if points:
-                folium.PolyLine(points, color='orange', weight=5, opacity=0.8, popup=busline.get('name')).add_to(m)
+        for busline in segment.buslines:
+            points = decode(busline.polyline)
+            if len(points):
+                folium.PolyLine(latlng(points).tolist(), color='orange', weight=5, opacity=0.8, popup=busline.name).add_to(m)
             # 标注公交站点
-            for stop in [busline.get('departure_stop')] + busline.get('via_stops', []) + [busline.get('arrival_stop')]:
-                if stop and 'location' in stop:
-                    lat, lng = map(float, stop['location'].split(','))
-                    folium.Marker([lng, lat], popup=stop.get('name', '公交站'), icon=folium.Icon(color='blue', icon='info-sign')).add_to(m)
+            for stop in busline.stops():
+                folium.Marker([stop.location.lat, stop.location.lng], popup=stop.name, icon=folium.Icon(color='blue', icon='info-sign')).add_to(m)
     m.save(output_file)
     print(f'路线图已保存为 {output_file}')
 
@@ -0,0 +1,107 @@
+"""高德查询结果的本地缓存（SQLite + 进程内字典）。
+
+键为 (接口, 城市, 归一化后的查询词)，每个接口有自己的 TTL；"查不到" 也会缓存（负缓存，
+TTL 较短），避免对同一个无结果的地址反复消耗配额。进程内字典挡在 SQLite 前面，
+重复查询不到 1 毫秒。
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+CACHE_PATH = os.environ.get(
+    'AMAP_CACHE_PATH',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.cache/amap_cache.sqlite3')),
+)
+# 表示 "查不到" 的缓存值
+NOT_FOUND = None
+
+
+def normalize(query):
+    """全角转半角、去首尾空白、合并空白、转小写，让写法略有不同的查询共用一条缓存。"""
+    query = unicodedata.normalize('NFKC', query or '')
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+class GeoCache:
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._memory = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS amap_cache ('
+            ' endpoint TEXT NOT NULL,'
+            ' city TEXT NOT NULL,'
+            ' query TEXT NOT NULL,'
+            ' value TEXT,'
+            ' expires_at REAL NOT NULL,'
+            ' PRIMARY KEY (endpoint, city, query))'
+        )
+
+    @staticmethod
+    def key(endpoint, city, query):
+        return endpoint, normalize(city), normalize(query)
+
+    def get(self, endpoint, city, query):
+        """返回 (是否命中, 值)；值为 NOT_FOUND 表示缓存了 "查不到"。"""
+        key = self.key(endpoint, city, query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    'SELECT value, expires_at FROM amap_cache WHERE endpoint = ? AND city = ? AND query = ?', key
+                ).fetchone()
+                if row is not None:
+                    entry = (row[1], json.loads(row[0]) if row[0] is not None else NOT_FOUND)
+                    self._memory[key] = entry
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, endpoint, city, query, value, ttl):
+        """写入一条结果，value 为 NOT_FOUND 时即负缓存。"""
+        key = self.key(endpoint, city, query)
+        expires_at = time.time() + ttl
+        payload = json.dumps(value, ensure_ascii=False) if value is not NOT_FOUND else None
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO amap_cache (endpoint, city, query, value, expires_at) VALUES (?, ?, ?, ?, ?)',
+                (*key, payload, expires_at),
+            )
+            self._conn.commit()
+
+    def purge(self):
+        """删除已过期的条目。"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute('DELETE FROM amap_cache WHERE expires_at <= ?', (time.time(),))
+            self._conn.commit()
+
+    def clear(self, endpoint=None):
+        with self._lock:
+            self._memory.clear()
+            if endpoint is None:
+                self._conn.execute('DELETE FROM amap_cache')
+            else:
+                self._conn.execute('DELETE FROM amap_cache WHERE endpoint = ?', (endpoint,))
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM amap_cache').fetchone()[0]
+        total = self.hits + self.misses
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0}
@@ -0,0 +1,123 @@
+"""从行程文件中提取按时间排序的地点，供预热缓存、批量地理编码和逐段路线规划使用。
+
+支持两种格式：
+- handbook/*/materials/trip_plan.md：每个 "### Day N" 章节下的 "- HH:MM 活动" 时间线，
+  城市取自 "行程总览" 表格的 区域/城市 列；
+- handbook/*/itinerary.json：{"date", "items": [{"time", "title", "detail"}]}，视为一天。
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+
+# 地点名的常见结尾
+PLACE_SUFFIXES = (
+    '博物馆', '陈列馆', '纪念馆', '展览馆', '纪念塔', '教堂', '大街', '步行街', '夜市', '市场', '广场',
+    '公园', '森林公园', '园', '湿地', '景区', '小镇', '码头', '火车站', '高铁站', '站', '机场', '酒店',
+    '民宿', '岛', '山', '泉', '寺', '塔', '沟', '河', '湖', '草原', '火山', '鹿苑', '老街', '商圈', '餐厅',
+)
+PLACE = re.compile(r'[一-鿿·]{1,14}(?:' + '|'.join(sorted(PLACE_SUFFIXES, key=len, reverse=True)) + ')')
+# 地点名前面常带的动作词：取最后一个动作词之后的部分，再去掉开头的单字动词
+VERBS = re.compile(r'前往|出发|抵达|到达|返回|回到|驱车|步行至|步行|沿江|游览|参观|进入|入住|离开|乘坐|'
+                   r'推荐|体验|可选|购票|检票|打卡|转场|自驾|登山|回')
+LEADING_VERB = re.compile(r'^[经赴至去到返离逛看拍登游在从进入往]+')
+# 不是地点的匹配结果
+NOT_PLACES = {'酒店', '景区', '市区', '江畔', '登山', '下山', '火山', '园', '沟', '站', '山', '河'}
+TIME = re.compile(r'^\s*[-*]\s*(\d{1,2}:\d{2})(?:\s*[-~–]\s*\d{1,2}:\d{2})?\s*[-–]?\s*(.+)$')
+DAY_HEADER = re.compile(r'^###\s*Day\s*(\d+)', re.IGNORECASE)
+OVERVIEW_ROW = re.compile(r'^\|\s*(\d+)\s*\|[^|]*\|\s*([^|]+?)\s*\|')
+
+
+@dataclass(slots=True)
+class PlanStop:
+    time: str
+    place: str
+    # 时间线原文
+    text: str = ''
+
+
+@dataclass(slots=True)
+class PlanDay:
+    day: int
+    city: str
+    stops: list = field(default_factory=list)
+
+    def timeline(self):
+        """当天按顺序出现的 (时间, 地点)，相邻重复的地点只保留第一次。"""
+        entries = []
+        for stop in self.stops:
+            if not entries or entries[-1][1] != stop.place:
+                entries.append((stop.time, stop.place))
+        return entries
+
+    def places(self):
+        """当天按顺序出现的地点（相邻重复只保留一个）。"""
+        return [place for _, place in self.timeline()]
+
+
+def extract_places(text):
+    """从一条时间线文本中提取地点名，括号内的补充说明不参与。"""
+    text = re.sub(r'[（(][^）)]*[）)]', '', text)
+    places = []
+    for part in re.split(r'[/／→+＋、，,。；;：:&]|或|及|和', text):
+        for match in PLACE.finditer(part.strip()):
+            name = LEADING_VERB.sub('', VERBS.split(match.group())[-1])
+            if len(name) >= 2 and name not in NOT_PLACES and not name.endswith('入园') and name not in places:
+                places.append(name)
+    return places
+
+
+def _city(region):
+    # "哈尔滨江北/江畔" -> "哈尔滨", "嘉荫 / 茅兰沟" -> "嘉荫", "伊春 → 哈尔滨" -> "伊春"
+    city = re.split(r'[\s/→+（(]', region.strip())[0]
+    return re.sub(r'(江北|江南|江畔|市区)$', '', city)
+
+
+def load_trip_plan(path):
+    """解析 trip_plan.md，返回 PlanDay 列表。"""
+    cities = {}
+    days = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            row = OVERVIEW_ROW.match(line)
+            if row and not days:
+                # 行程总览表在前，后面交通等表格的同名列不覆盖
+                cities.setdefault(int(row.group(1)), _city(row.group(2)))
+                continue
+            header = DAY_HEADER.match(line)
+            if header:
+                number = int(header.group(1))
+                days.append(PlanDay(number, cities.get(number, '')))
+                continue
+            if line.startswith('## '):
+                # 行程章节之后的表格不再属于某一天
+                if days:
+                    days.append(None)
+                continue
+            entry = TIME.match(line)
+            if entry and days and days[-1] is not None:
+                for place in extract_places(entry.group(2)):
+                    days[-1].stops.append(PlanStop(entry.group(1), place, entry.group(2).strip()))
+    return [day for day in days if day is not None]
+
+
+def load_itinerary_json(path, city=''):
+    """解析 itinerary.json（单日行程），返回只含一天的 PlanDay 列表。"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    day = PlanDay(1, city)
+    for item in data.get('items', []):
+        for place in extract_places(item.get('title', '')):
+            day.stops.append(PlanStop(item.get('time', '').split('-')[0], place, item.get('title', '')))
+    return [day]
+
+
+def load(path, city=''):
+    """按扩展名解析行程文件。"""
+    if path.endswith('.json'):
+        return load_itinerary_json(path, city)
+    days = load_trip_plan(path)
+    if city:
+        for day in days:
+            day.city = city
+    return days
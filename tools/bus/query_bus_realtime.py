@@ -1,36 +1,27 @@
-import requests
 import sys
+from amap_client import AmapError, get_client
 
 def query_bus_realtime(city, line_name, station_name, amap_key):
+    client = get_client(amap_key)
     # Step 1: 获取线路ID
-    line_url = 'https://restapi.amap.com/v3/bus/linename'
-    line_params = {
-        'city': city,
-        'keywords': line_name,
-        'key': amap_key
-    }
-    line_resp = requests.get(line_url, params=line_params).json()
-    print('线路查询接口返回:', line_resp)
-    if not line_resp.get('buslines'):
+    lines = client.bus_lines(line_name, city)
+    print('线路查询结果:', lines)
+    if not lines:
         print('未找到线路')
         return
-    line_id = line_resp['buslines'][0]['id']
+    line_id = lines[0][0]
 
     # Step 2: 查询实时公交到站信息
-    realtime_url = 'https://restapi.amap.com/v4/bus/bus_realtime'
-    realtime_params = {
-        'city': city,
-        'lineid': line_id,
-        'key': amap_key
-    }
-    realtime_resp = requests.get(realtime_url, params=realtime_params).json()
-    print('实时公交接口返回:', realtime_resp)
-    if 'data' not in realtime_resp or 'stations' not in realtime_resp['data']:
+    try:
+        stations = client.bus_realtime(line_id, city)
+    except AmapError as e:
+        print('实时公交接口返回错误:', e)
+        stations = []
+    if not stations:
         print('未找到实时公交信息')
         return
 
     # Step 3: 查找目标站点
-    stations = realtime_resp['data']['stations']
     for station in stations:
         if station['name'] == station_name:
             buses = station.get('bus', [])
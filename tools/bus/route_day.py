@@ -0,0 +1,135 @@
+"""一天行程的逐段公交路线规划。
+
+给定按顺序排列的地点（来自 trip_plan.md 的时间线或 itinerary.json），先批量地理编码，
+再把相邻两点之间的每一段路线请求并发发出（并发数有上限），最后汇总成一个多段结果。
+总耗时约为一次地理编码 + 一次路线请求的往返，而不是 N 次。
+
+用法示例：
+  python tools/bus/route_day.py handbook/heilongjiang2025/materials/trip_plan.md --day 1
+  python tools/bus/route_day.py handbook/ulanqab20250830/itinerary.json --city 乌兰察布 --json day_route.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import itinerary  # noqa: E402
+from amap_client import AmapError, get_client  # noqa: E402
+from gen_route_json import transit_to_route_data  # noqa: E402
+
+# 同时进行的路线请求数
+ROUTE_WORKERS = 8
+
+
+@dataclass(slots=True)
+class Leg:
+    time: str
+    origin: str
+    destination: str
+    # 最优方案，没有路线时为 None
+    transit: object = None
+    error: str = ''
+
+
+@dataclass(slots=True)
+class DayRoute:
+    city: str
+    legs: list
+
+    @property
+    def duration(self):
+        return sum(leg.transit.duration for leg in self.legs if leg.transit)
+
+    @property
+    def walking_distance(self):
+        return sum(leg.transit.walking_distance for leg in self.legs if leg.transit)
+
+    def to_route_data(self):
+        """gen_trip_plotly 可直接读取的 json：所有段的 segments 依次拼接，另附每段摘要。"""
+        data = {'segments': [], 'legs': []}
+        for leg in self.legs:
+            data['legs'].append({
+                'time': leg.time, 'origin': leg.origin, 'destination': leg.destination,
+                'duration': leg.transit.duration if leg.transit else None,
+                'walking_distance': leg.transit.walking_distance if leg.transit else None,
+                'error': leg.error,
+            })
+            if leg.transit:
+                data['segments'].extend(transit_to_route_data(leg.transit)['segments'])
+        return data
+
+
+def route_day(client, stops, city, max_workers=ROUTE_WORKERS):
+    """
+    stops 为按顺序的 (时间, 地点) 或地点名，返回 DayRoute。
+    地点先批量地理编码，相邻两点之间的路线并发查询。
+    """
+    stops = [(None, stop) if isinstance(stop, str) else stop for stop in stops]
+    geos = client.geocode_batch([place for _, place in stops], city or None)
+    legs = [Leg(stops[i][0] or '', stops[i][1], stops[i + 1][1]) for i in range(len(stops) - 1)]
+
+    def plan(i):
+        leg, origin, destination = legs[i], geos[i], geos[i + 1]
+        if not origin or not destination:
+            leg.error = '地理编码失败'
+            return
+        # 跨城时 AMap 需要终点城市
+        cityd = destination.city if destination.city and destination.city != origin.city else None
+        try:
+            transits = client.transit(origin.location, destination.location, origin.city or city, cityd=cityd)
+        except AmapError as e:
+            leg.error = str(e)
+            return
+        if transits:
+            leg.transit = transits[0]
+        else:
+            leg.error = '未找到公交路线'
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(plan, range(len(legs))))
+    return DayRoute(city, legs)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="一天行程的逐段公交路线规划")
+    parser.add_argument('plan', help='trip_plan.md 或 itinerary.json')
+    parser.add_argument('--day', type=int, default=1, help='第几天（从 1 开始）')
+    parser.add_argument('--city', default='', help='覆盖行程中的城市')
+    parser.add_argument('--json', help='把多段路线写入 json（gen_trip_plotly 可读）')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    days = {day.day: day for day in itinerary.load(args.plan, args.city)}
+    if args.day not in days:
+        print(f"行程中没有第 {args.day} 天")
+        sys.exit(1)
+    day = days[args.day]
+    client = get_client()
+    started = time.perf_counter()
+    route = route_day(client, day.timeline(), day.city)
+    elapsed = time.perf_counter() - started
+
+    for leg in route.legs:
+        if leg.transit:
+            lines = [bus.name for segment in leg.transit.segments for bus in segment.buslines]
+            print(f"{leg.time} {leg.origin} → {leg.destination}: {leg.transit.duration // 60} 分钟, "
+                  f"步行 {leg.transit.walking_distance} 米, {' / '.join(lines) or '步行'}")
+        else:
+            print(f"{leg.time} {leg.origin} → {leg.destination}: {leg.error}")
+    print(f"\n第 {args.day} 天 {route.city}: {len(route.legs)} 段, 合计 {route.duration // 60} 分钟, "
+          f"步行 {route.walking_distance} 米, 耗时 {elapsed:.2f}s, 实际请求 {client.requests} 次")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(route.to_route_data(), f, ensure_ascii=False, indent=2)
+        print(f'多段路线数据已保存为 {args.json}')
+
+
+if __name__ == '__main__':
+    main()
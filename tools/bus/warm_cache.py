@@ -0,0 +1,53 @@
+"""预热高德查询缓存：把行程文件里出现的所有地点批量地理编码一遍（每个请求 10 个地址）。
+
+之后 query_bus_route / gen_route_json / 地图脚本查询这些地点时直接命中本地缓存。
+
+用法示例：
+  python tools/bus/warm_cache.py handbook/heilongjiang2025/materials/trip_plan.md
+  python tools/bus/warm_cache.py handbook/ulanqab20250830/itinerary.json --city 乌兰察布 --poi
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import itinerary  # noqa: E402
+from amap_client import AmapError, get_client  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="预热高德地理编码 / POI 缓存")
+    parser.add_argument('plan', help='trip_plan.md 或 itinerary.json')
+    parser.add_argument('--city', default='', help='覆盖行程中的城市')
+    parser.add_argument('--poi', action='store_true', help='同时预热 POI 搜索')
+    return parser.parse_args()
+
+
+def warm(days, client, poi=False):
+    """返回 (地点数, 找到的数量)。"""
+    places = sorted({(place, day.city) for day in days for place in day.places()})
+    geos = client.geocode_batch([(place, city or None) for place, city in places])
+    for (place, city), geo in zip(places, geos):
+        print(f"{city} {place}: {geo.location if geo else '未找到'}")
+    if poi:
+        for place, city in places:
+            try:
+                client.search_poi(place, city or None)
+            except AmapError as e:
+                print(f"{city} {place}: {e}")
+    return len(places), sum(1 for geo in geos if geo)
+
+
+def main():
+    args = parse_args()
+    client = get_client()
+    started = time.perf_counter()
+    total, found = warm(itinerary.load(args.plan, args.city), client, args.poi)
+    print(f"\n地点: {total}, 找到: {found}, 耗时 {time.perf_counter() - started:.2f}s, 实际请求 {client.requests} 次")
+    print(f"缓存: {client.cache.stats() if client.cache else '未启用'}")
+
+
+if __name__ == '__main__':
+    main()